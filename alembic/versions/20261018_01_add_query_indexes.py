@@ -0,0 +1,76 @@
+"""Add indexes for event listing and registration queries
+
+Revision ID: add_query_indexes_20261018_01
+Revises: add_cascade_regs_fk_20250810_01
+Create Date: 2026-10-18 09:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_query_indexes_20261018_01"
+down_revision: str | Sequence[str] | None = "add_cascade_regs_fk_20250810_01"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        # list_events: WHERE date >= now() ORDER BY date, id
+        op.create_index(
+            "ix_events_date_id",
+            "events",
+            ["date", "id"],
+            postgresql_concurrently=True,
+        )
+        # my_events: WHERE organizer_id = ? ORDER BY date, id
+        op.create_index(
+            "ix_events_organizer_id_date_id",
+            "events",
+            ["organizer_id", "date", "id"],
+            postgresql_concurrently=True,
+        )
+        # Upcoming public events by date
+        op.create_index(
+            "ix_events_public_date_id",
+            "events",
+            ["date", "id"],
+            postgresql_where=sa.text("is_public"),
+            postgresql_concurrently=True,
+        )
+        # list_registrations / status updates: WHERE event_id = ? [AND status = ?]
+        # ORDER BY created_at
+        op.create_index(
+            "ix_registrations_event_id_status_created_at",
+            "registrations",
+            ["event_id", "status", "created_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_registrations_event_id_status_created_at",
+            table_name="registrations",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_events_public_date_id",
+            table_name="events",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_events_organizer_id_date_id",
+            table_name="events",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_events_date_id", table_name="events", postgresql_concurrently=True
+        )
@@ -0,0 +1,49 @@
+"""Add capacity and seats_taken to events
+
+Revision ID: add_event_capacity_20261018_02
+Revises: add_query_indexes_20261018_01
+Create Date: 2026-10-18 12:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_event_capacity_20261018_02"
+down_revision: str | Sequence[str] | None = "add_query_indexes_20261018_01"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("capacity", sa.Integer(), nullable=True))
+    op.add_column(
+        "events",
+        sa.Column("seats_taken", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Existing accepted registrations already hold seats
+    op.execute(
+        """
+        UPDATE events SET seats_taken = accepted.total
+        FROM (
+            SELECT event_id, count(*) AS total
+            FROM registrations
+            WHERE status = 'accepted'
+            GROUP BY event_id
+        ) AS accepted
+        WHERE events.id = accepted.event_id
+        """
+    )
+    op.create_check_constraint(
+        "ck_events_seats", "events", "capacity IS NULL OR seats_taken <= capacity"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_events_seats", "events", type_="check")
+    op.drop_column("events", "seats_taken")
+    op.drop_column("events", "capacity")
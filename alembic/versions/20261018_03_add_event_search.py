@@ -0,0 +1,58 @@
+"""Add a generated full-text search vector to events
+
+Revision ID: add_event_search_20261018_03
+Revises: add_event_capacity_20261018_02
+Create Date: 2026-10-18 15:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_event_search_20261018_03"
+down_revision: str | Sequence[str] | None = "add_event_capacity_20261018_02"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Same expression as app.models.event.SEARCH_VECTOR at the time of writing
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table under an exclusive
+    # lock; schedule it for a quiet window on large installs
+    op.add_column(
+        "events",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_search_vector",
+            "events",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_events_search_vector",
+            table_name="events",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("events", "search_vector")
@@ -0,0 +1,43 @@
+"""Add registration_counts, per-event counters by status
+
+Revision ID: add_reg_counts_20261018_04
+Revises: add_event_search_20261018_03
+Create Date: 2026-10-18 15:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_reg_counts_20261018_04"
+down_revision: str | Sequence[str] | None = "add_event_search_20261018_03"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "registration_counts",
+        sa.Column("event_id", sa.Uuid(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id", "status", "shard"),
+    )
+    op.execute(
+        """
+        INSERT INTO registration_counts (event_id, status, shard, count)
+        SELECT event_id, status, 0, count(*)
+        FROM registrations
+        GROUP BY event_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("registration_counts")
@@ -0,0 +1,96 @@
+"""Add analytics rollup tables and updated_at indexes
+
+Revision ID: add_rollups_20261018_05
+Revises: add_reg_counts_20261018_04
+Create Date: 2026-10-18 17:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_rollups_20261018_05"
+down_revision: str | Sequence[str] | None = "add_reg_counts_20261018_04"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "registration_daily_rollups",
+        sa.Column("event_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("organizer_id", sa.Uuid(), nullable=False),
+        sa.Column("waitlist", sa.Integer(), nullable=False),
+        sa.Column("accepted", sa.Integer(), nullable=False),
+        sa.Column("rejected", sa.Integer(), nullable=False),
+        sa.Column("cancelled", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id", "day"),
+    )
+    op.create_index(
+        "ix_registration_daily_rollups_organizer_id_day",
+        "registration_daily_rollups",
+        ["organizer_id", "day"],
+    )
+    op.create_table(
+        "event_rollups",
+        sa.Column("event_id", sa.Uuid(), nullable=False),
+        sa.Column("organizer_id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("waitlist", sa.Integer(), nullable=False),
+        sa.Column("accepted", sa.Integer(), nullable=False),
+        sa.Column("rejected", sa.Integer(), nullable=False),
+        sa.Column("cancelled", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    op.create_index(
+        "ix_event_rollups_organizer_id", "event_rollups", ["organizer_id"]
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("value", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_registrations_updated_at",
+            "registrations",
+            ["updated_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_events_updated_at",
+            "events",
+            ["updated_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_events_updated_at", table_name="events", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_registrations_updated_at",
+            table_name="registrations",
+            postgresql_concurrently=True,
+        )
+    op.drop_table("rollup_watermarks")
+    op.drop_index("ix_event_rollups_organizer_id", table_name="event_rollups")
+    op.drop_table("event_rollups")
+    op.drop_index(
+        "ix_registration_daily_rollups_organizer_id_day",
+        table_name="registration_daily_rollups",
+    )
+    op.drop_table("registration_daily_rollups")
@@ -1,26 +1,35 @@
 from datetime import datetime, timedelta, UTC
 from fastapi import Request, Response
 from jose import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from starlette_admin.auth import AuthProvider
 from starlette_admin.exceptions import LoginFailed
 
 from app.models.user import User
-from app.utils.dependencies import get_db
-from app.utils.password import verify_password
+from app.database.database import AsyncSessionLocal
+from app.utils.password import HashingServiceBusyError, hashing_service
 from app.core.config import settings
 
 
 class JSONAuthProvider(AuthProvider):
     async def login(self, email: str, password: str, remember_me: bool, request: Request, response: Response):
-        db: Session = next(get_db())
-        user = db.query(User).filter(User.email == email).first()
+        async with AsyncSessionLocal() as db:
+            user = await db.scalar(select(User).filter(User.email == email))
 
-        if not user or not user.is_admin:
-            raise LoginFailed("Invalid admin credentials.")
+            if not user or not user.is_admin:
+                raise LoginFailed("Invalid admin credentials.")
 
-        if not verify_password(password, user.password_hash):
-            raise LoginFailed("Incorrect password.")
+            try:
+                is_valid, new_hash = await hashing_service.verify(
+                    password, user.password_hash
+                )
+            except HashingServiceBusyError as err:
+                raise LoginFailed("Server is busy, please try again.") from err
+            if not is_valid:
+                raise LoginFailed("Incorrect password.")
+            if new_hash:
+                user.password_hash = new_hash
+                await db.commit()
 
         token_data = {
             "sub": user.email,
@@ -49,8 +58,8 @@ class JSONAuthProvider(AuthProvider):
             if not email or payload.get("exp") < datetime.now(UTC).timestamp():
                 return None
 
-            db: Session = next(get_db())
-            user = db.query(User).filter(User.email == email).first()
+            async with AsyncSessionLocal() as db:
+                user = await db.scalar(select(User).filter(User.email == email))
 
             if user and user.is_admin:
                 return user
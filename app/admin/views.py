@@ -1,8 +1,11 @@
-from typing import ClassVar
+from typing import Any, ClassVar
+from starlette.requests import Request
 from starlette_admin.contrib.sqla import ModelView
 from app.models.user import User
 from app.models.event import Event
 from app.models.registration import Registration
+from app.utils.cache import invalidate_event, invalidate_event_lists_async
+from app.utils.user_cache import invalidate_user
 
 
 class UserAdminView(ModelView):
@@ -15,6 +18,12 @@ class UserAdminView(ModelView):
     export_fields: ClassVar[list[str]] = fields
     export_types: ClassVar[list[str]] = ["csv", "excel", "pdf", "print"]
 
+    async def after_edit(self, request: Request, obj: Any) -> None:
+        await invalidate_user(obj.id)
+
+    async def after_delete(self, request: Request, obj: Any) -> None:
+        await invalidate_user(obj.id)
+
 
 class EventAdminView(ModelView):
     fields: ClassVar[list[str]] = [
@@ -26,6 +35,15 @@ class EventAdminView(ModelView):
     export_fields: ClassVar[list[str]] = fields
     export_types: ClassVar[list[str]] = ["csv", "excel", "pdf", "print"]
 
+    async def after_create(self, request: Request, obj: Any) -> None:
+        await invalidate_event_lists_async()
+
+    async def after_edit(self, request: Request, obj: Any) -> None:
+        await invalidate_event(obj.id)
+
+    async def after_delete(self, request: Request, obj: Any) -> None:
+        await invalidate_event(obj.id)
+
 
 class RegistrationAdminView(ModelView):
     fields: ClassVar[list[str]] = [
@@ -1,26 +1,109 @@
+import os
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool (applied to both the sync and the async engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
     JWT_SECRET_KEY: str
     JWT_REFRESH_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_HOURS: int
 
+    # Argon2 cost; hashes made with other parameters are upgraded on login
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Hashing process pool, per app worker
+    PASSWORD_HASH_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
     # === REDIS (Celery Broker/Backend) ===
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
 
     # Redis
     REDIS_URL: str
+    # Async client connection pool, per app worker; callers wait up to
+    # REDIS_POOL_TIMEOUT for a free connection once all are in use
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5
+    # Socket timeouts and health checks apply to the sync client as well
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+
+    # Verification codes: lifetime, and a sliding-window limit on sends
+    VERIFICATION_CODE_TTL: int = 600
+    VERIFICATION_SENDS_PER_WINDOW: int = 3
+    VERIFICATION_RATE_WINDOW: int = 600
+
+    # Read-through cache TTLs (seconds)
+    EVENT_CACHE_TTL: int = 60
+    EVENT_LIST_CACHE_TTL: int = 15
+
+    # Authenticated user snapshots: per-process LRU in front of Redis
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_LOCAL_TTL: float = 15
+    USER_CACHE_REDIS_TTL: int = 300
+
+    # Upcoming-only event search ranks at most this many matches (the
+    # soonest ones), so very common terms cost the same as rare ones
+    EVENT_SEARCH_CANDIDATES: int = 500
+
+    # Write-behind registration ingestion: public registrations go to a Redis
+    # Stream and a Celery beat task batch-inserts them
+    REGISTRATION_WRITE_BEHIND: bool = False
+    REGISTRATION_FLUSH_INTERVAL: float = 1.0
+    REGISTRATION_FLUSH_BATCH_SIZE: int = 500
+
+    # Per-event registration counters are recounted and repaired by a Celery
+    # beat task; events are locked this many at a time while recounting
+    REGISTRATION_COUNTS_RECONCILE_INTERVAL: float = 3600
+    REGISTRATION_COUNTS_RECONCILE_BATCH_SIZE: int = 100
+
+    # Organizer analytics rollups (Celery beat); each run re-scans the last
+    # ANALYTICS_ROLLUP_LAG seconds to catch late commits
+    ANALYTICS_ROLLUP_INTERVAL: float = 300
+    ANALYTICS_ROLLUP_LAG: float = 120
+
+    # Bearer token required to scrape /metrics; open when unset
+    METRICS_TOKEN: str | None = None
+
+    # Opt-in SQL profiling: slow statements are logged with their EXPLAIN
+    # plan, and a statement repeated N_PLUS_ONE_THRESHOLD times in one
+    # request is reported as a likely N+1
+    QUERY_PROFILING: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # Fail requests that exceed their route's query budget instead of
+    # logging them (for test runs)
+    QUERY_BUDGET_ENFORCE: bool = False
 
     SMTP_SERVER: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
     EMAIL_ADDRESS: str
     EMAIL_PASSWORD: str
     EMAIL_SENDER_NAME: str = "Event Manager"
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT: float = 10
+    # Per Celery worker process; sessions idle longer than the healthcheck
+    # interval are probed with NOOP before reuse
+    SMTP_POOL_SIZE: int = 2
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_HEALTHCHECK_INTERVAL: float = 30
 
     class Config:
         env_file = ".env"
@@ -1,11 +1,49 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.config import settings
+from app.database.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.utils.metrics import instrument_engine
+from app.utils.query_profiler import install_query_profiler
 
-engine = create_engine(settings.DATABASE_URL)
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+engine = create_engine(
+    settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options
+)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL
+    or make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    poolclass=InstrumentedAsyncQueuePool,
+    **pool_options,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+if settings.QUERY_PROFILING:
+    install_query_profiler(engine)
+    install_query_profiler(async_engine.sync_engine)
+
+
+def pool_stats() -> dict[str, dict]:
+    return {
+        "sync": engine.pool.stats_snapshot(),
+        "async": async_engine.pool.stats_snapshot(),
+    }
+
 
 class Base(DeclarativeBase):
     pass
@@ -1,15 +1,36 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
 from app.admin.setup import admin
 from app.routers import auth as auth_router
 from app.routers import event as event_router
+from app.routers import internal as internal_router
+from app.routers import metrics as metrics_router
 from app.routers import registration as registration_router
+from app.utils.conditional import ETAG_HEADER, LAST_MODIFIED_HEADER
+from app.utils.metrics import MetricsMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.password import HashingServiceBusyError, hashing_service
+from app.utils.query_profiler import QueryProfilerMiddleware
+from app.utils.redis import async_redis_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    hashing_service.shutdown()
+    await async_redis_pool.aclose()
+
 
 app = FastAPI(
     title="Event Management System",
     description="A system to manage events",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -18,7 +39,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, LAST_MODIFIED_HEADER],
 )
+app.add_middleware(QueryProfilerMiddleware)
+# Outermost, so latencies include the other middleware
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(HashingServiceBusyError)
+async def hashing_service_busy_handler(
+    request: Request, exc: HashingServiceBusyError
+):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/")
@@ -29,5 +65,7 @@ def read_root():
 app.include_router(auth_router.router)
 app.include_router(event_router.router)
 app.include_router(registration_router.router)
+app.include_router(internal_router.router)
+app.include_router(metrics_router.router)
 
 admin.mount_to(app)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from .analytics import EventRollup, RegistrationDailyRollup, RollupWatermark  # noqa
 from .event import Event  # noqa
-from .registration import Registration  # noqa
+from .registration import Registration, RegistrationCount  # noqa
 from .user import User  # noqa
@@ -0,0 +1,52 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+
+class RegistrationDailyRollup(Base):
+    """Registrations per event and UTC day of sign-up, by current status."""
+
+    __tablename__ = "registration_daily_rollups"
+    __table_args__ = (
+        Index("ix_registration_daily_rollups_organizer_id_day", "organizer_id", "day"),
+    )
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    organizer_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    waitlist: Mapped[int] = mapped_column(default=0)
+    accepted: Mapped[int] = mapped_column(default=0)
+    rejected: Mapped[int] = mapped_column(default=0)
+    cancelled: Mapped[int] = mapped_column(default=0)
+
+
+class EventRollup(Base):
+    """Per-event totals of the daily rollups, with what listings need to show."""
+
+    __tablename__ = "event_rollups"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    organizer_id: Mapped[uuid.UUID] = mapped_column(nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    waitlist: Mapped[int] = mapped_column(default=0)
+    accepted: Mapped[int] = mapped_column(default=0)
+    rejected: Mapped[int] = mapped_column(default=0)
+    cancelled: Mapped[int] = mapped_column(default=0)
+
+
+class RollupWatermark(Base):
+    """How far each rollup has processed its source rows (by `updated_at`)."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,16 +1,50 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import (
+    CheckConstraint,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.database import Base
 
 from .timestamp_mixin import TimeMixin
 
+SEARCH_CONFIG = "english"
+# Title matches rank above location, location above description
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(location, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
 
 class Event(Base, TimeMixin):
     __tablename__ = "events"
+    __table_args__ = (
+        CheckConstraint(
+            "capacity IS NULL OR seats_taken <= capacity", name="ck_events_seats"
+        ),
+        Index("ix_events_date_id", "date", "id"),
+        Index("ix_events_organizer_id_date_id", "organizer_id", "date", "id"),
+        Index(
+            "ix_events_public_date_id",
+            "date",
+            "id",
+            postgresql_where=text("is_public"),
+        ),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        # Analytics rollups pick up changed events by updated_at
+        Index("ix_events_updated_at", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -19,6 +53,14 @@ class Event(Base, TimeMixin):
     date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     share_uuid: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4, unique=True)
     is_public: Mapped[bool] = mapped_column(default=False)
+    # None means unlimited; registrations are then triaged by hand
+    capacity: Mapped[int | None] = mapped_column(nullable=True)
+    # Number of accepted registrations, maintained on every status change
+    seats_taken: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Maintained by Postgres; deferred so regular loads don't fetch it
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True
+    )
 
     organizer_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     organizer = relationship("User", back_populates="events")
@@ -1,7 +1,7 @@
 import uuid
 from enum import Enum
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, SmallInteger, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.database import Base
@@ -18,7 +18,17 @@ class Status(str,Enum):
 
 class Registration(Base, TimeMixin):
     __tablename__ = "registrations"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "ix_registrations_event_id_status_created_at",
+            "event_id",
+            "status",
+            "created_at",
+        ),
+        # Analytics rollups pick up new and changed registrations by updated_at
+        Index("ix_registrations_updated_at", "updated_at"),
+        {"extend_existing": True},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String, nullable=False)
@@ -31,3 +41,21 @@ class Registration(Base, TimeMixin):
         ForeignKey("events.id", ondelete="CASCADE"), nullable=False
     )
     event = relationship("Event", back_populates="registrations")
+
+
+class RegistrationCount(Base):
+    """
+    Registrations per event and status, updated in the same transaction as
+    every status change so dashboards never have to count rows. Each counter
+    is split over a few shard rows (summed on read) so concurrent
+    registrations don't queue on a single row lock.
+    """
+
+    __tablename__ = "registration_counts"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[str] = mapped_column(String, primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    count: Mapped[int] = mapped_column(default=0, server_default="0")
@@ -1,4 +1,7 @@
+import math
+
 from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import func, select
 
 from app.models.user import User
 from app.schemas.auth import (
@@ -11,20 +14,28 @@ from app.schemas.auth import (
 from app.schemas.user import UserOut
 from app.utils.dependencies import current_user_dependency, db_dependency
 from app.utils.jwt_token import create_access_token, create_refresh_token
-from app.utils.password import hash_password, verify_password
-from app.utils.redis import (
-    retrieve_verification_code,
-    delete_verification_code,
-    clear_rate_limit,
+from app.utils.password import hashing_service
+from app.utils.redis import consume_verification_code_async
+from app.utils.tasks import (
+    VerificationRateLimitedError,
+    send_verification_email_task_async,
 )
-from app.utils.tasks import send_verification_email_task
+from app.utils.user_cache import invalidate_user
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def rate_limited(exc: VerificationRateLimitedError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(exc),
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 @router.post("/register")
-def register_user(payload: RegisterSchema, db: db_dependency):
+async def register_user(payload: RegisterSchema, db: db_dependency):
     """
     Register a new user.  
     The very first user becomes admin and is automatically confirmed.
@@ -32,31 +43,33 @@ def register_user(payload: RegisterSchema, db: db_dependency):
     """
     try:
    
-        user_count = db.query(User).count()
+        user_count = await db.scalar(select(func.count()).select_from(User))
         is_first_user = user_count == 0
 
         user = User(
             email=payload.email,
-            password_hash=hash_password(payload.password),
+            password_hash=await hashing_service.hash(payload.password),
             is_active=True,
             is_confirmed=is_first_user,
             is_admin=is_first_user,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
 
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="User already exists")
 
     if not is_first_user:
         try:
-            send_verification_email_task(payload.email)
+            await send_verification_email_task_async(payload.email)
         except Exception as e:
          
-            db.delete(user)
-            db.commit()
+            await db.delete(user)
+            await db.commit()
+            if isinstance(e, VerificationRateLimitedError):
+                raise rate_limited(e) from e
             raise HTTPException(status_code=429, detail=str(e))
 
     return {
@@ -69,8 +82,8 @@ def register_user(payload: RegisterSchema, db: db_dependency):
 
 
 @router.post("/resend-code")
-def resend_verification_code(payload: ResendEmail, db: db_dependency):
-    user = db.query(User).filter_by(email=payload.email).first()
+async def resend_verification_code(payload: ResendEmail, db: db_dependency):
+    user = await db.scalar(select(User).filter_by(email=payload.email))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -78,7 +91,9 @@ def resend_verification_code(payload: ResendEmail, db: db_dependency):
         return {"detail": "User already confirmed"}
 
     try:
-        send_verification_email_task(payload.email)
+        await send_verification_email_task_async(payload.email)
+    except VerificationRateLimitedError as e:
+        raise rate_limited(e) from e
     except Exception as e:
         raise HTTPException(status_code=429, detail=str(e))
 
@@ -86,32 +101,37 @@ def resend_verification_code(payload: ResendEmail, db: db_dependency):
 
 
 @router.post("/verify-code/")
-def verify_code(payload: VerifyCodeSchema, db: db_dependency):
-    code_in_redis = retrieve_verification_code(payload.email)
-    if not code_in_redis or code_in_redis != payload.code:
+async def verify_code(payload: VerifyCodeSchema, db: db_dependency):
+    if not await consume_verification_code_async(payload.email, payload.code):
         raise HTTPException(
             status_code=400, detail="Invalid or expired verification code"
         )
 
-    user = db.query(User).filter(User.email == payload.email).first()
+    user = await db.scalar(select(User).filter(User.email == payload.email))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     user.is_confirmed = True
-    db.commit()
-
-
-    delete_verification_code(payload.email)
-    clear_rate_limit(payload.email)
+    await db.commit()
+    await invalidate_user(user.id)
 
     return {"detail": "Email verified successfully"}
 
 
 @router.post("/login/", response_model=TokenSchema)
-def login(payload: LoginSchema, db: db_dependency):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginSchema, db: db_dependency):
+    user = await db.scalar(select(User).filter(User.email == payload.email))
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid email or password")
+
+    is_valid, new_hash = await hashing_service.verify(
+        payload.password, user.password_hash
+    )
+    if not is_valid:
         raise HTTPException(status_code=400, detail="Invalid email or password")
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
 
     if not user.is_confirmed:
         raise HTTPException(status_code=403, detail="Email not verified")
@@ -128,12 +148,15 @@ def login(payload: LoginSchema, db: db_dependency):
 
 
 @router.get("/me/", response_model=UserOut)
-def get_me(current_user: current_user_dependency):
+async def get_me(current_user: current_user_dependency):
     return current_user
 
 
 @router.delete("/delete-me/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_my_account(current_user: current_user_dependency, db: db_dependency):
-    db.delete(current_user)
-    db.commit()
+async def delete_my_account(current_user: current_user_dependency, db: db_dependency):
+    user = await db.get(User, current_user.id)
+    if user:
+        await db.delete(user)
+        await db.commit()
+    await invalidate_user(current_user.id)
     return None  
\ No newline at end of file
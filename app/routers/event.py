@@ -1,16 +1,101 @@
+from collections.abc import Sequence
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from sqlalchemy import Row, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.event import Event
-from app.schemas.event import EventCreate, EventOut, EventUpdate
+from app.core.config import settings
+from app.models.event import SEARCH_CONFIG, Event
+from app.schemas.event import (
+    EventCreate,
+    EventOut,
+    EventStatsOut,
+    EventUpdate,
+    OrganizerAnalyticsOut,
+    event_list_adapter,
+)
+from app.utils.analytics import organizer_analytics
+from app.utils.cache import (
+    cached_fields,
+    event_key,
+    event_list_key,
+    invalidate_event,
+    invalidate_event_lists_async,
+    read_event,
+    read_through,
+)
+from app.utils.conditional import (
+    is_conditional,
+    not_modified,
+    not_modified_response,
+    page_validators,
+    validator_headers,
+)
 from app.utils.dependencies import current_user_dependency, db_dependency
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.utils.query_profiler import query_budget
+from app.utils.registration_counts import registration_counts
+from app.utils.responses import JSON_MEDIA_TYPE, dump_rows, rows_response
+from app.utils.seats import (
+    free_seats,
+    lock_event,
+    promote_waitlisted,
+    reset_seat_counter_async,
+)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Read-only list endpoints select just these columns instead of loading
+# whole entities; updated_at feeds the page validators
+EVENT_LIST_COLUMNS = [
+    *(getattr(Event, name) for name in EventOut.model_fields),
+    Event.updated_at,
+]
+
+skip_query = Annotated[int, Query(deprecated=True, description="Use `cursor` instead")]
+
+# Clients may store responses but must revalidate them (cheaply, see below)
+PUBLIC_CACHE_CONTROL = "no-cache"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def page_query(query: Select, cursor: str | None, skip: int, limit: int) -> Select:
+    query = query.order_by(Event.date.asc(), Event.id.asc())
+    if cursor:
+        query = query.filter(tuple_(Event.date, Event.id) > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    # One extra row tells whether there is a following page
+    return query.limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: int) -> tuple[list, str | None]:
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].date, rows[-1].id)
+
+
+async def paginate_events(
+    db: AsyncSession,
+    query: Select,
+    cursor: str | None,
+    skip: int,
+    limit: int,
+) -> tuple[list[Row], str | None]:
+    """
+    Keyset pagination on (date, id). Returns the page and the cursor for the
+    following one, if any; `skip` is only honoured when no cursor is given.
+    """
+    result = await db.execute(page_query(query, cursor, skip, limit))
+    return split_page(result.all(), limit)
+
 
 @router.post("/events/", response_model=EventOut)
-def create_event(
+async def create_event(
     payload: EventCreate,
     db: db_dependency,
     current_user: current_user_dependency,
@@ -23,69 +108,275 @@ def create_event(
 
     event = Event(**payload.model_dump(), organizer_id=current_user.id)
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    await invalidate_event_lists_async()
     return event
 
 
-@router.get("/events/", response_model=list[EventOut])
-def list_events(
+def filter_listed(query: Select, upcoming_only: bool, public_only: bool) -> Select:
+    from datetime import datetime
+
+    if upcoming_only:
+        query = query.filter(Event.date >= datetime.utcnow())
+    if public_only:
+        query = query.filter(Event.is_public)
+    return query
+
+
+@router.get(
+    "/events/", response_model=list[EventOut], dependencies=[query_budget(1)]
+)
+async def list_events(
+    request: Request,
     db: db_dependency,
-    skip: int = 0,
+    cursor: str | None = None,
+    skip: skip_query = 0,
     limit: int = 10,
     upcoming_only: bool = True,
+    public_only: bool = False,
 ):
-    from datetime import datetime
+    """
+    Honours If-None-Match: a page whose cached ETag matches is answered with
+    a 304 straight from Redis, without reading the cached body.
+    """
+
+    async def key():
+        return await event_list_key(
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            upcoming_only=upcoming_only,
+            public_only=public_only,
+        )
+
+    async def load():
+        query = filter_listed(
+            select(*EVENT_LIST_COLUMNS), upcoming_only, public_only
+        )
+        events, next_cursor = await paginate_events(db, query, cursor, skip, limit)
+        validators = page_validators(
+            ((event.id, event.updated_at) for event in events), next_cursor
+        )
+        return {
+            "body": dump_rows(event_list_adapter, events).decode(),
+            "next_cursor": next_cursor or "",
+            **validators,
+        }
+
+    def page_headers(entry: dict) -> dict[str, str]:
+        headers = validator_headers(entry, PUBLIC_CACHE_CONTROL)
+        if entry.get("next_cursor"):
+            headers[NEXT_CURSOR_HEADER] = entry["next_cursor"]
+        return headers
+
+    if is_conditional(request):
+        cached = await cached_fields(
+            "event_list_validators", key, "etag", "last_modified", "next_cursor"
+        )
+        if cached and not_modified(request, cached, use_last_modified=False):
+            return not_modified_response(page_headers(cached))
+
+    entry = await read_through(
+        "event_list", key, settings.EVENT_LIST_CACHE_TTL, load
+    )
+    headers = page_headers(entry)
+    if not_modified(request, entry, use_last_modified=False):
+        return not_modified_response(headers)
+    return Response(entry["body"], media_type=JSON_MEDIA_TYPE, headers=headers)
 
-    query = db.query(Event)
+
+def search_query(
+    q: str, limit: int, upcoming_only: bool, public_only: bool
+) -> Select:
+    """
+    Every match is ranked when `upcoming_only` is off: selective terms are
+    looked up in the GIN index, and Postgres keeps only the best `limit`
+    while sorting. Upcoming searches rank only the soonest
+    EVENT_SEARCH_CANDIDATES matches, so common terms let Postgres walk the
+    date index and stop early instead of scoring every future event.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    matches = filter_listed(
+        select(Event).filter(Event.search_vector.bool_op("@@")(tsquery)),
+        upcoming_only,
+        public_only,
+    )
     if upcoming_only:
-        query = query.filter(Event.date >= datetime.utcnow())
-    return query.order_by(Event.date.asc()).offset(skip).limit(limit).all()
+        matches = matches.order_by(Event.date.asc(), Event.id.asc()).limit(
+            settings.EVENT_SEARCH_CANDIDATES
+        )
+    matched = aliased(Event, matches.subquery())
+    return (
+        select(*(getattr(matched, name) for name in EventOut.model_fields))
+        .order_by(
+            func.ts_rank(matched.search_vector, tsquery).desc(),
+            matched.date.asc(),
+            matched.id.asc(),
+        )
+        .limit(limit)
+    )
 
 
-@router.get("/my/", response_model=list[EventOut])
-def my_events(
+@router.get(
+    "/search", response_model=list[EventOut], dependencies=[query_budget(1)]
+)
+async def search_events(
     db: db_dependency,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    upcoming_only: bool = True,
+    public_only: bool = False,
+):
+    """
+    Full-text search over title, location and description, best match first.
+    `q` takes web-search syntax: "quoted phrases", `or` and `-excluded`.
+    With `upcoming_only` (the default), only the soonest matching events
+    (EVENT_SEARCH_CANDIDATES, 500 by default) are ranked; turn it off to rank
+    every match.
+    """
+    result = await db.execute(search_query(q, limit, upcoming_only, public_only))
+    return rows_response(event_list_adapter, result.all())
+
+
+@router.get(
+    "/my/", response_model=list[EventOut], dependencies=[query_budget(3)]
+)
+async def my_events(
+    db: db_dependency,
+    request: Request,
     current_user: current_user_dependency,
-    skip: int = 0,
+    cursor: str | None = None,
+    skip: skip_query = 0,
     limit: int = 50,
 ):
-    query = db.query(Event).filter_by(organizer_id=current_user.id)
-    return query.offset(skip).limit(limit).all()
+    """
+    Honours If-None-Match. Revalidating only reads (id, date, updated_at) of
+    the page; full rows are loaded when it has changed.
+    """
+    query = select(*EVENT_LIST_COLUMNS).filter_by(organizer_id=current_user.id)
+    if is_conditional(request):
+        rows = await db.execute(
+            page_query(query, cursor, skip, limit).with_only_columns(
+                Event.id, Event.date, Event.updated_at
+            )
+        )
+        page, next_cursor = split_page(rows.all(), limit)
+        validators = page_validators(
+            ((row.id, row.updated_at) for row in page), next_cursor
+        )
+        if not_modified(request, validators, use_last_modified=False):
+            headers = validator_headers(validators, PRIVATE_CACHE_CONTROL)
+            if next_cursor:
+                headers[NEXT_CURSOR_HEADER] = next_cursor
+            return not_modified_response(headers)
+
+    events, next_cursor = await paginate_events(db, query, cursor, skip, limit)
+    validators = page_validators(
+        ((event.id, event.updated_at) for event in events), next_cursor
+    )
+    headers = validator_headers(validators, PRIVATE_CACHE_CONTROL)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows_response(event_list_adapter, events, headers)
 
 
-@router.get("/events/{event_id}", response_model=EventOut)
-def get_event(event_id: UUID, db: db_dependency):
-    event = db.query(Event).filter_by(id=event_id).first()
-    if not event:
+@router.get("/my/analytics", response_model=OrganizerAnalyticsOut)
+async def my_analytics(
+    db: db_dependency,
+    current_user: current_user_dependency,
+    days: Annotated[int, Query(ge=1, le=366)] = 30,
+    top: Annotated[int, Query(ge=1, le=50)] = 5,
+):
+    """
+    Daily registrations, waitlist-to-accepted conversion and top events across
+    the organizer's events, served from the rollup tables; see `refreshed_at`.
+    """
+    return await organizer_analytics(db, current_user.id, days, top)
+
+
+@router.get(
+    "/events/{event_id}", response_model=EventOut, dependencies=[query_budget(1)]
+)
+async def get_event(event_id: UUID, request: Request, db: db_dependency):
+    """
+    Honours If-None-Match and If-Modified-Since: when the cached validators
+    match, the 304 is answered from Redis without reading the cached body.
+    """
+    if is_conditional(request):
+        cached = await cached_fields(
+            "event_validators", event_key(event_id), "etag", "last_modified"
+        )
+        if cached and not_modified(request, cached):
+            return not_modified_response(
+                validator_headers(cached, PUBLIC_CACHE_CONTROL)
+            )
+
+    entry = await read_event(db, event_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event
+    headers = validator_headers(entry, PUBLIC_CACHE_CONTROL)
+    if not_modified(request, entry):
+        return not_modified_response(headers)
+    return Response(entry["body"], media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get(
+    "/events/{event_id}/stats",
+    response_model=EventStatsOut,
+    dependencies=[query_budget(3)],
+)
+async def get_event_stats(
+    event_id: UUID, db: db_dependency, current_user: current_user_dependency
+):
+    """Registration counts by status, read from the maintained counters."""
+    organizer_id = await db.scalar(select(Event.organizer_id).filter_by(id=event_id))
+    if organizer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    counts = await registration_counts(db, event_id)
+    return EventStatsOut(**counts, total=sum(counts.values()))
 
 
 @router.put("/events/{event_id}", response_model=EventOut)
-def update_event(
+async def update_event(
     event_id: UUID,
     payload: EventUpdate,
     db: db_dependency,
     current_user: current_user_dependency,
 ):
-    event = db.query(Event).filter_by(id=event_id).first()
+    event = await db.scalar(select(Event).filter_by(id=event_id))
     if not event or event.organizer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
-    for key, value in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    if "capacity" in changes:
+        event = await lock_event(db, event_id)
+        capacity = changes["capacity"]
+        if capacity is not None and capacity < event.seats_taken:
+            raise HTTPException(
+                status_code=400,
+                detail="Capacity is below the number of accepted registrations",
+            )
+    for key, value in changes.items():
         setattr(event, key, value)
-    db.commit()
-    db.refresh(event)
+    if "capacity" in changes:
+        await db.flush()
+        await promote_waitlisted(db, event, free_seats(event))
+    await db.commit()
+    await db.refresh(event)
+    await invalidate_event(event_id)
+    if "capacity" in changes:
+        await reset_seat_counter_async(event_id)
     return event
 
 
 @router.delete("/events/{event_id}")
-def delete_event(
+async def delete_event(
     event_id: UUID, db: db_dependency, current_user: current_user_dependency
 ):
-    event = db.query(Event).filter_by(id=event_id).first()
+    event = await db.scalar(select(Event).filter_by(id=event_id))
     if not event or event.organizer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
+    await invalidate_event(event_id)
     return {"detail": "Event deleted"}
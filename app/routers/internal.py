@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, status
+
+from app.database.database import pool_stats
+from app.utils.cache import cache_stats
+from app.utils.dependencies import current_user_dependency
+from app.utils.redis import async_redis_pool
+from app.utils.registration_stream import stream_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/pool-stats")
+async def get_pool_stats(current_user: current_user_dependency):
+    """
+    Connection pool usage for the sync and async engines and the async Redis
+    client: connections in use, overflow and checkout wait times.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admins only"
+        )
+    return {**pool_stats(), "redis": async_redis_pool.stats_snapshot()}
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(current_user: current_user_dependency):
+    """Read-through cache hits, misses and Redis errors for this worker."""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admins only"
+        )
+    return cache_stats.snapshot()
+
+
+@router.get("/registration-stream")
+def get_registration_stream_stats(current_user: current_user_dependency):
+    """
+    Write-behind ingestion backlog, lag and flush counters. A plain `def`:
+    `stream_stats` uses the sync Redis client, so it runs in the threadpool.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admins only"
+        )
+    return stream_stats()
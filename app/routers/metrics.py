@@ -0,0 +1,31 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.core.config import settings
+from app.utils.metrics import QueueDepthCollector, render_metrics, scrape_registry
+from app.utils.tasks import celery_app, celery_queues
+
+router = APIRouter(tags=["metrics"], include_in_schema=False)
+
+scrape_registry.register(QueueDepthCollector(celery_app, celery_queues()))
+
+
+@router.get("/metrics")
+def get_metrics(request: Request):
+    """
+    Prometheus exposition of request, SQL, Redis and Celery metrics. Open
+    unless METRICS_TOKEN is set, then scrapers must send it as a bearer token.
+    """
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(
+            token, settings.METRICS_TOKEN
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
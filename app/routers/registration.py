@@ -1,76 +1,393 @@
+import csv
+import io
+import itertools
+import logging
+from collections import Counter
+from collections.abc import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from redis import RedisError
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
 from app.models.event import Event
 from app.models.registration import Registration, Status
 from app.schemas.registration import (
+    RegistrationBulkUpdate,
+    RegistrationBulkUpdateOut,
     RegistrationCreate,
+    RegistrationImportOut,
     RegistrationOut,
+    RegistrationQueuedOut,
     RegistrationUpdate,
+    registration_list_adapter,
 )
+from app.utils.cache import read_event
 from app.utils.dependencies import current_user_dependency, db_dependency
+from app.utils.query_profiler import query_budget
+from app.utils.registration_counts import moved, record_counts
+from app.utils.registration_import import (
+    IMPORT_COLUMNS,
+    ImportReport,
+    InvalidUploadError,
+    detect_media_type,
+    validated_records,
+)
+from app.utils.registration_stream import enqueue_registration
+from app.utils.responses import row_dicts, rows_response
+from app.utils.seats import (
+    adjust_seats,
+    allocate_seat,
+    count_by_status,
+    free_seats,
+    lock_event,
+    promote_waitlisted,
+    reset_seat_counter_async,
+    return_counter_seat,
+)
+from app.utils.user_cache import UserSnapshot
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/registrations", tags=["registrations"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+STREAM_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 5000
+
+# Listing and streaming select just these columns, not whole entities
+REGISTRATION_OUT_COLUMNS = [
+    getattr(Registration, name) for name in RegistrationOut.model_fields
+]
+
+
+async def stream_registrations(event_id: UUID, media_type: str) -> AsyncIterator[str]:
+    """
+    Stream an event's registrations in batches through a server-side cursor,
+    so memory stays flat regardless of the number of registrants.
+
+    Uses its own session: the request's session is closed once the endpoint
+    returns, before the response body is sent.
+    """
+    fields = list(RegistrationOut.model_fields)
+    query = (
+        select(*REGISTRATION_OUT_COLUMNS)
+        .filter_by(event_id=event_id)
+        .order_by(Registration.created_at.asc(), Registration.id.asc())
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        if media_type == CSV_MEDIA_TYPE:
+            yield ",".join(fields) + "\r\n"
+
+        async for batch in result.partitions():
+            rows = registration_list_adapter.validate_python(row_dicts(batch))
+            if media_type == CSV_MEDIA_TYPE:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(row.model_dump(mode="json").values() for row in rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(row.model_dump_json() + "\n" for row in rows)
+
 
-@router.post("/events/{event_id}/register", response_model=RegistrationOut)
-def register_for_event(event_id: UUID, payload: RegistrationCreate, db: db_dependency):
-    event = db.query(Event).filter_by(id=event_id).first()
+@router.post(
+    "/events/{event_id}/register",
+    response_model=RegistrationOut | RegistrationQueuedOut,
+    responses={
+        202: {
+            "model": RegistrationQueuedOut,
+            "description": "Queued for write-behind ingestion",
+        }
+    },
+)
+async def register_for_event(
+    event_id: UUID, payload: RegistrationCreate, db: db_dependency, response: Response
+):
+    if settings.REGISTRATION_WRITE_BEHIND:
+        if not await read_event(db, event_id):
+            raise HTTPException(status_code=404, detail="Event not found")
+        try:
+            registration_id = await enqueue_registration(event_id, payload)
+        except RedisError:
+            logger.warning("Registration stream unavailable", exc_info=True)
+        else:
+            response.status_code = 202
+            return RegistrationQueuedOut(id=registration_id, event_id=event_id)
+
+    event = await db.scalar(select(Event).filter_by(id=event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    registration = Registration(
-        event_id=event_id, status=Status.WAITLIST, **payload.model_dump()
-    )
-    db.add(registration)
-    db.commit()
-    db.refresh(registration)
+    status = Status.WAITLIST
+    try:
+        if event.capacity is not None and await allocate_seat(db, event):
+            status = Status.ACCEPTED
+
+        registration = Registration(
+            event_id=event_id, status=status, **payload.model_dump()
+        )
+        db.add(registration)
+        await record_counts(db, moved(event_id, None, status))
+        await db.commit()
+    except BaseException:
+        if event.capacity is not None:
+            await return_counter_seat(event_id)
+        raise
+    await db.refresh(registration)
     return registration
 
 
-@router.get("/events/{event_id}/registrations", response_model=list[RegistrationOut])
-def list_registrations(
-    event_id: UUID, db: db_dependency, current_user: current_user_dependency
+@router.post(
+    "/events/{event_id}/registrations/import", response_model=RegistrationImportOut
+)
+async def import_registrations(
+    event_id: UUID,
+    file: UploadFile,
+    db: db_dependency,
+    current_user: current_user_dependency,
 ):
-    event = db.query(Event).filter_by(id=event_id).first()
+    """
+    Bulk-load registrations from a CSV (with a header row) or NDJSON upload.
+    Rows are validated as they are read and valid ones are loaded with COPY in
+    a single transaction; invalid rows are skipped and reported by row number.
+    """
+    event = await db.scalar(select(Event).filter_by(id=event_id))
     if not event or event.organizer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    return db.query(Registration).filter_by(event_id=event_id).all()
+    media_type = detect_media_type(file.content_type, file.filename)
+    if not media_type:
+        raise HTTPException(status_code=415, detail="Upload a CSV or NDJSON file")
 
+    report = ImportReport()
+    records = validated_records(file.file, media_type, event_id, report)
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    try:
+        while batch := await run_in_threadpool(
+            list, itertools.islice(records, IMPORT_BATCH_SIZE)
+        ):
+            await raw_connection.driver_connection.copy_records_to_table(
+                Registration.__tablename__, records=batch, columns=IMPORT_COLUMNS
+            )
+    except InvalidUploadError as err:
+        # Nothing is committed: batches already copied are rolled back
+        raise HTTPException(status_code=400, detail=str(err)) from err
+    await record_counts(db, moved(event_id, None, Status.WAITLIST, report.imported))
+    await db.commit()
 
-@router.put("/registrations/{registration_id}", response_model=RegistrationOut)
-def update_registration_status(
-    registration_id: UUID,
-    payload: RegistrationUpdate,
+    return RegistrationImportOut(
+        imported=report.imported, failed=report.failed, errors=report.errors
+    )
+
+
+@router.get(
+    "/events/{event_id}/registrations",
+    response_model=list[RegistrationOut],
+    dependencies=[query_budget(3)],
+    responses={
+        200: {
+            "content": {
+                NDJSON_MEDIA_TYPE: {},
+                CSV_MEDIA_TYPE: {},
+            },
+            "description": "JSON list, or a stream when NDJSON/CSV is requested via Accept",
+        }
+    },
+)
+async def list_registrations(
+    event_id: UUID,
+    request: Request,
     db: db_dependency,
     current_user: current_user_dependency,
 ):
-    reg = db.query(Registration).filter_by(id=registration_id).first()
-    if not reg:
-        raise HTTPException(status_code=404, detail="Registration not found")
+    event = await db.scalar(select(Event).filter_by(id=event_id))
+    if not event or event.organizer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
 
-    event = db.query(Event).filter_by(id=reg.event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    accept = request.headers.get("accept", "")
+    for media_type in (NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE):
+        if media_type in accept:
+            headers = {}
+            if media_type == CSV_MEDIA_TYPE:
+                headers["Content-Disposition"] = (
+                    f'attachment; filename="registrations-{event_id}.csv"'
+                )
+            return StreamingResponse(
+                stream_registrations(event_id, media_type),
+                media_type=media_type,
+                headers=headers,
+            )
 
-   
-    if payload.status in [Status.ACCEPTED, Status.REJECTED]:
+    result = await db.execute(
+        select(*REGISTRATION_OUT_COLUMNS).filter_by(event_id=event_id)
+    )
+    return rows_response(registration_list_adapter, result.all())
+
+
+def check_transition(
+    event: Event, reg: Registration, status: Status, current_user: UserSnapshot
+) -> None:
+    """Only the organizer accepts/rejects; rejected registrations stay rejected."""
+    if status in [Status.ACCEPTED, Status.REJECTED]:
         if event.organizer_id != current_user.id:
             raise HTTPException(
                 status_code=403, detail="Not authorized to accept/reject"
             )
 
-    elif payload.status == Status.CANCELLED:
+    elif status == Status.CANCELLED:
         if reg.status == Status.REJECTED:
             raise HTTPException(status_code=403, detail="Cannot cancel after rejection")
 
     else:
         raise HTTPException(status_code=400, detail="Invalid status update")
 
+
+@router.put("/registrations/{registration_id}", response_model=RegistrationOut)
+async def update_registration_status(
+    registration_id: UUID,
+    payload: RegistrationUpdate,
+    db: db_dependency,
+    current_user: current_user_dependency,
+):
+    reg = await db.scalar(select(Registration).filter_by(id=registration_id))
+    if not reg:
+        raise HTTPException(status_code=404, detail="Registration not found")
+
+    event = await lock_event(db, reg.event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    # Re-read under the event lock, a concurrent transition may have won
+    reg = await db.scalar(
+        select(Registration)
+        .filter_by(id=registration_id)
+        .execution_options(populate_existing=True)
+    )
+    if not reg:
+        raise HTTPException(status_code=404, detail="Registration not found")
+
+    check_transition(event, reg, payload.status, current_user)
+    delta = (payload.status == Status.ACCEPTED) - (reg.status == Status.ACCEPTED)
+    if delta > 0 and event.capacity is not None and not free_seats(event):
+        raise HTTPException(status_code=409, detail="Event is at full capacity")
+
+    await record_counts(db, moved(event.id, reg.status, payload.status))
     reg.status = payload.status
-    db.commit()
-    db.refresh(reg)
+    await adjust_seats(db, event, delta)
+    if delta < 0:
+        await promote_waitlisted(db, event, free_seats(event))
+    await db.commit()
+    if delta:
+        await reset_seat_counter_async(event.id)
+    await db.refresh(reg)
     return reg
 
+
+async def listed_seat_delta(
+    db: AsyncSession, event: Event, ids: list[UUID], status: Status
+) -> tuple[dict[str, int], int]:
+    """
+    Current statuses of the listed registrations and the change in taken
+    seats once they all have `status`; refuses to accept past capacity.
+    """
+    counts = await count_by_status(db, event.id, ids)
+    accepted = counts.get(Status.ACCEPTED, 0)
+    if status != Status.ACCEPTED:
+        return counts, -accepted
+    delta = sum(counts.values()) - accepted
+    if event.capacity is not None and delta > free_seats(event):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Only {free_seats(event)} seats left",
+        )
+    return counts, delta
+
+
+def waitlist_head(event: Event, limit: int) -> Select:
+    """Ids of the `limit` longest-waiting registrations, capped by free seats."""
+    if event.capacity is not None:
+        limit = min(limit, free_seats(event))
+    return (
+        select(Registration.id)
+        .filter_by(event_id=event.id, status=Status.WAITLIST)
+        .order_by(Registration.created_at.asc(), Registration.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+@router.put(
+    "/events/{event_id}/registrations/status",
+    response_model=RegistrationBulkUpdateOut,
+)
+async def bulk_update_registration_status(
+    event_id: UUID,
+    payload: RegistrationBulkUpdate,
+    db: db_dependency,
+    current_user: current_user_dependency,
+):
+    """
+    Accept/reject many registrations of one event, or accept the first N
+    waitlisted ones, as a single UPDATE ... RETURNING. Like the single-item
+    path, only the event's organizer may accept or reject. Accepting never
+    exceeds the event's capacity and seats freed by rejections go to the
+    waitlist.
+    """
+    event = await lock_event(db, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event.organizer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to accept/reject")
+
+    if payload.ids is not None:
+        status = payload.status
+        counts, delta = await listed_seat_delta(db, event, payload.ids, status)
+        targets = Registration.id.in_(payload.ids)
+    else:
+        status = Status.ACCEPTED
+        targets = Registration.id.in_(
+            waitlist_head(event, payload.accept_waitlisted)
+        )
+
+    result = await db.scalars(
+        update(Registration)
+        .where(
+            Registration.event_id == event_id,
+            Registration.status != status,
+            targets,
+        )
+        .values(status=status)
+        .returning(Registration)
+        .execution_options(synchronize_session=False)
+    )
+    registrations = result.all()
+    transitions = Counter()
+    if payload.accept_waitlisted is not None:
+        delta = len(registrations)
+        transitions = moved(event_id, Status.WAITLIST, status, delta)
+    else:
+        for previous, n in counts.items():
+            transitions.update(moved(event_id, previous, status, n))
+
+    await adjust_seats(db, event, delta)
+    await record_counts(db, transitions)
+    promoted = []
+    if delta < 0:
+        promoted = await promote_waitlisted(db, event, free_seats(event))
+    await db.commit()
+    if delta:
+        await reset_seat_counter_async(event_id)
+
+    return RegistrationBulkUpdateOut(
+        updated=len(registrations),
+        registrations=[RegistrationOut.model_validate(reg) for reg in registrations],
+        promoted=[RegistrationOut.model_validate(reg) for reg in promoted],
+    )
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class EventCreate(BaseModel):
@@ -10,6 +10,7 @@ class EventCreate(BaseModel):
     location: str
     date: datetime
     is_public: bool = False
+    capacity: int | None = Field(default=None, ge=0)
 
 
 class EventUpdate(BaseModel):
@@ -18,9 +19,49 @@ class EventUpdate(BaseModel):
     location: str | None = None
     date: datetime | None = None
     is_public: bool | None = None
+    capacity: int | None = Field(default=None, ge=0)
+
+
+class EventStatsOut(BaseModel):
+    waitlist: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    cancelled: int = 0
+    total: int = 0
+
+
+class DailyRegistrationsOut(BaseModel):
+    day: date
+    registrations: int
+    accepted: int
+
+
+class TopEventOut(BaseModel):
+    event_id: UUID
+    title: str
+    date: datetime
+    registrations: int
+    accepted: int
+    # Share of registrants that ended up accepted; None without registrations
+    conversion_rate: float | None
+
+
+class OrganizerAnalyticsOut(BaseModel):
+    registrations: int
+    waitlist: int
+    accepted: int
+    rejected: int
+    cancelled: int
+    conversion_rate: float | None
+    daily: list[DailyRegistrationsOut]
+    top_events: list[TopEventOut]
+    # When the rollups were last brought up to date; None before the first run
+    refreshed_at: datetime | None
 
 
 class EventOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     title: str
     description: str | None
@@ -28,6 +69,9 @@ class EventOut(BaseModel):
     date: datetime
     share_uuid: UUID
     is_public: bool
+    capacity: int | None = None
+
 
-    class Config:
-        orm_mode = True
+# Built once: validating and dumping through an adapter reuses its compiled
+# core schema instead of going through FastAPI's per-response field handling
+event_list_adapter = TypeAdapter(list[EventOut])
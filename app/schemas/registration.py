@@ -1,6 +1,15 @@
+from typing import Self
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    TypeAdapter,
+    field_validator,
+    model_validator,
+)
 
 from app.models.registration import Status
 
@@ -11,12 +20,57 @@ class RegistrationCreate(BaseModel):
     phone: str
     email: EmailStr | None = None
 
+    @field_validator("name", "surname", "phone")
+    @classmethod
+    def reject_nul(cls, value: str | None) -> str | None:
+        # Postgres text cannot store NUL, the insert (or COPY) would fail
+        if value is not None and "\x00" in value:
+            raise ValueError("must not contain NUL characters")
+        return value
+
+
+class RegistrationQueuedOut(BaseModel):
+    """
+    A registration accepted for write-behind ingestion. The row appears under
+    `id` once the stream is flushed; its status is decided then.
+    """
+
+    id: UUID
+    event_id: UUID
+    queued: bool = True
+
 
 class RegistrationUpdate(BaseModel):
     status: Status
 
 
+class RegistrationBulkUpdate(BaseModel):
+    """
+    Either set `status` (accepted/rejected) on the given `ids`, or accept the
+    first `accept_waitlisted` waitlisted registrations by sign-up time.
+    """
+
+    ids: list[UUID] | None = Field(default=None, min_length=1, max_length=5000)
+    status: Status | None = None
+    accept_waitlisted: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def check_mode(self) -> Self:
+        if (self.ids is None) == (self.accept_waitlisted is None):
+            raise ValueError("Provide either ids or accept_waitlisted")
+        if self.ids is not None and self.status not in (
+            Status.ACCEPTED,
+            Status.REJECTED,
+        ):
+            raise ValueError("status must be accepted or rejected")
+        if self.accept_waitlisted is not None and self.status is not None:
+            raise ValueError("status cannot be combined with accept_waitlisted")
+        return self
+
+
 class RegistrationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     name: str
     surname: str | None = None
@@ -24,5 +78,23 @@ class RegistrationOut(BaseModel):
     email: str | None = None
     status: Status
 
-    class Config:
-        orm_mode = True
+
+registration_list_adapter = TypeAdapter(list[RegistrationOut])
+
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class RegistrationImportOut(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ImportRowError]
+
+
+class RegistrationBulkUpdateOut(BaseModel):
+    updated: int
+    registrations: list[RegistrationOut]
+    # Waitlisted registrations that took seats freed by this update
+    promoted: list[RegistrationOut] = []
@@ -0,0 +1,206 @@
+"""
+Organizer analytics, precomputed.
+
+`rollup_registrations` (a Celery beat task) folds registrations created or
+changed since the previous run into `registration_daily_rollups` (per event
+and UTC day of sign-up) and `event_rollups` (per-event totals).
+`organizer_analytics` reads only those tables, so dashboards never aggregate
+over `registrations` on the primary.
+
+Runs are incremental from a watermark on `updated_at`. Each run re-scans the
+last ANALYTICS_ROLLUP_LAG seconds before the watermark, for rows whose
+transaction committed after the previous run or whose app clock lagged.
+Touched buckets are recomputed in full, so scanning a row twice is harmless.
+"""
+
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import Date, DateTime, and_, cast, func, select, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.analytics import EventRollup, RegistrationDailyRollup, RollupWatermark
+from app.models.event import Event
+from app.models.registration import Registration, Status
+from app.schemas.event import (
+    DailyRegistrationsOut,
+    OrganizerAnalyticsOut,
+    TopEventOut,
+)
+
+WATERMARK = "registrations"
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+STATUSES = [status.value for status in Status]
+
+
+def _utc_day(column):
+    return cast(func.timezone("UTC", column), Date)
+
+
+def _total(model):
+    return model.waitlist + model.accepted + model.rejected + model.cancelled
+
+
+def _upsert(model, source, keys: list[str]):
+    columns = list(source.selected_columns.keys())
+    statement = insert(model).from_select(columns, source)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={name: statement.excluded[name] for name in columns if name not in keys},
+    )
+
+
+def _rollup_days(db: Session, since: datetime) -> int:
+    touched = (
+        select(
+            Registration.event_id,
+            _utc_day(Registration.created_at).label("day"),
+        )
+        .where(Registration.updated_at > since)
+        .distinct()
+        .cte("touched")
+    )
+    day_start = func.timezone("UTC", cast(touched.c.day, DateTime))
+    source = (
+        select(
+            touched.c.event_id,
+            touched.c.day,
+            Event.organizer_id,
+            *[
+                func.count().filter(Registration.status == status).label(status)
+                for status in STATUSES
+            ],
+        )
+        .select_from(touched)
+        .join(
+            Registration,
+            and_(
+                Registration.event_id == touched.c.event_id,
+                Registration.created_at >= day_start,
+                Registration.created_at < day_start + timedelta(days=1),
+            ),
+        )
+        .join(Event, Event.id == touched.c.event_id)
+        .group_by(touched.c.event_id, touched.c.day, Event.organizer_id)
+    )
+    result = db.execute(
+        _upsert(RegistrationDailyRollup, source, ["event_id", "day"])
+    )
+    return result.rowcount
+
+
+def _rollup_events(db: Session, since: datetime) -> None:
+    # Events with new or changed registrations, and renamed/rescheduled ones
+    touched = union(
+        select(Registration.event_id).where(Registration.updated_at > since),
+        select(Event.id).where(Event.updated_at > since),
+    ).cte("touched_events")
+    daily = RegistrationDailyRollup
+    source = (
+        select(
+            Event.id.label("event_id"),
+            Event.organizer_id,
+            Event.title,
+            Event.date,
+            *[
+                func.coalesce(func.sum(getattr(daily, status)), 0).label(status)
+                for status in STATUSES
+            ],
+        )
+        .join(touched, touched.c.event_id == Event.id)
+        .outerjoin(daily, daily.event_id == Event.id)
+        .group_by(Event.id)
+    )
+    db.execute(_upsert(EventRollup, source, ["event_id"]))
+
+
+def rollup_registrations(lag: float) -> int:
+    """Bring the rollups up to date, returning the number of day buckets refreshed."""
+    with SessionLocal() as db:
+        db.execute(
+            insert(RollupWatermark)
+            .values(name=WATERMARK, value=EPOCH)
+            .on_conflict_do_nothing()
+        )
+        # Also keeps overlapping runs from interleaving
+        watermark = db.scalar(
+            select(RollupWatermark).filter_by(name=WATERMARK).with_for_update()
+        )
+        started_at = db.scalar(select(func.now()))
+        since = watermark.value - timedelta(seconds=lag)
+
+        refreshed = _rollup_days(db, since)
+        _rollup_events(db, since)
+        watermark.value = started_at
+        db.commit()
+    return refreshed
+
+
+async def organizer_analytics(
+    db: AsyncSession, organizer_id: UUID, days: int, top: int
+) -> OrganizerAnalyticsOut:
+    first_day = datetime.now(UTC).date() - timedelta(days=days - 1)
+    daily = RegistrationDailyRollup
+    per_day = {
+        day: (registrations, accepted)
+        for day, registrations, accepted in await db.execute(
+            select(daily.day, func.sum(_total(daily)), func.sum(daily.accepted))
+            .filter(daily.organizer_id == organizer_id, daily.day >= first_day)
+            .group_by(daily.day)
+        )
+    }
+    totals = (
+        await db.execute(
+            select(
+                *[
+                    func.coalesce(func.sum(getattr(EventRollup, status)), 0)
+                    for status in STATUSES
+                ]
+            ).filter(EventRollup.organizer_id == organizer_id)
+        )
+    ).one()
+    top_events = await db.scalars(
+        select(EventRollup)
+        .filter_by(organizer_id=organizer_id)
+        .order_by(_total(EventRollup).desc(), EventRollup.date.asc())
+        .limit(top)
+    )
+    refreshed_at = await db.scalar(
+        select(RollupWatermark.value).filter_by(name=WATERMARK)
+    )
+
+    trend = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        registered, accepted = per_day.get(day, (0, 0))
+        trend.append(
+            DailyRegistrationsOut(day=day, registrations=registered, accepted=accepted)
+        )
+
+    counts = dict(zip(STATUSES, totals, strict=True))
+    registrations = sum(counts.values())
+    return OrganizerAnalyticsOut(
+        **counts,
+        registrations=registrations,
+        conversion_rate=_rate(counts[Status.ACCEPTED.value], registrations),
+        daily=trend,
+        top_events=[
+            TopEventOut(
+                event_id=event.event_id,
+                title=event.title,
+                date=event.date,
+                registrations=_total(event),
+                accepted=event.accepted,
+                conversion_rate=_rate(event.accepted, _total(event)),
+            )
+            for event in top_events
+        ],
+        refreshed_at=refreshed_at,
+    )
+
+
+def _rate(accepted: int, registrations: int) -> float | None:
+    return round(accepted / registrations, 4) if registrations else None
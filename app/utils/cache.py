@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from threading import Lock
+from uuid import UUID
+
+from redis import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.event import Event
+from app.schemas.event import EventOut
+from app.utils.conditional import event_validators
+from app.utils.redis import async_redis_client, redis_client
+
+logger = logging.getLogger(__name__)
+
+EVENT_CACHE_PREFIX = "cache:event"
+EVENT_LIST_CACHE_PREFIX = "cache:events"
+EVENT_LIST_VERSION_KEY = "cache:events:version"
+
+# Stampede protection: only the lock holder loads from the database,
+# everyone else polls for the value it stores.
+LOCK_TTL_MS = 5000
+LOCK_POLL_INTERVAL = 0.02
+LOCK_POLL_ATTEMPTS = 25
+# Spread expirations so hot keys written together don't expire together
+TTL_JITTER = 0.1
+
+CacheEntry = dict[str, str]
+CacheKey = str | Callable[[], Awaitable[str]]
+
+
+class CacheStats:
+    """Per-process hit/miss counters, keyed by cache name."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def incr(self, name: str, field: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                name, {"hits": 0, "misses": 0, "errors": 0}
+            )
+            counters[field] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            snapshot = {}
+            for name, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                snapshot[name] = {
+                    **counters,
+                    "hit_ratio": round(counters["hits"] / lookups, 4)
+                    if lookups
+                    else 0.0,
+                }
+            return snapshot
+
+
+cache_stats = CacheStats()
+
+
+def event_key(event_id: UUID) -> str:
+    return f"{EVENT_CACHE_PREFIX}:{event_id}"
+
+
+async def event_list_key(**params) -> str:
+    """
+    List pages are keyed by the current list version, so bumping the version
+    invalidates every cached page at once; stale pages simply expire.
+    """
+    version = await async_redis_client.get(EVENT_LIST_VERSION_KEY) or "0"
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{EVENT_LIST_CACHE_PREFIX}:{version}:{digest}"
+
+
+async def invalidate_event(event_id: UUID) -> None:
+    try:
+        async with async_redis_client.pipeline() as pipe:
+            pipe.delete(event_key(event_id))
+            pipe.incr(EVENT_LIST_VERSION_KEY)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Failed to invalidate cached event %s", event_id, exc_info=True)
+
+
+def invalidate_event_lists() -> None:
+    try:
+        redis_client.incr(EVENT_LIST_VERSION_KEY)
+    except RedisError:
+        logger.warning("Failed to invalidate cached event lists", exc_info=True)
+
+
+async def invalidate_event_lists_async() -> None:
+    try:
+        await async_redis_client.incr(EVENT_LIST_VERSION_KEY)
+    except RedisError:
+        logger.warning("Failed to invalidate cached event lists", exc_info=True)
+
+
+async def _store(key: str, entry: CacheEntry, ttl: int) -> None:
+    ttl = max(1, round(ttl * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)))
+    async with async_redis_client.pipeline() as pipe:
+        pipe.hset(key, mapping=entry)
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+
+async def cached_fields(name: str, key: CacheKey, *fields: str) -> CacheEntry | None:
+    """
+    Only `fields` of a cached entry (say, its validators but not the body),
+    or None if it isn't cached or Redis is unavailable.
+    """
+    try:
+        key = await key() if callable(key) else key
+        values = await async_redis_client.hmget(key, fields)
+    except RedisError:
+        logger.warning("Cache read failed for %s", name, exc_info=True)
+        cache_stats.incr(name, "errors")
+        return None
+    if values[0] is None:
+        cache_stats.incr(name, "misses")
+        return None
+    cache_stats.incr(name, "hits")
+    return dict(zip(fields, values, strict=True))
+
+
+async def read_through(
+    name: str,
+    key: CacheKey,
+    ttl: int,
+    loader: Callable[[], Awaitable[CacheEntry | None]],
+) -> CacheEntry | None:
+    """
+    Return the cached entry for `key`, loading and storing it on a miss.
+    `loader` returns None for missing rows, which are not cached. Redis
+    failures fall back to the loader so the cache never takes reads down.
+    """
+    try:
+        key = await key() if callable(key) else key
+        entry = await async_redis_client.hgetall(key)
+        if entry:
+            cache_stats.incr(name, "hits")
+            return entry
+
+        lock_key = f"{key}:lock"
+        locked = await async_redis_client.set(lock_key, "1", nx=True, px=LOCK_TTL_MS)
+        if not locked:
+            for _ in range(LOCK_POLL_ATTEMPTS):
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                entry = await async_redis_client.hgetall(key)
+                if entry:
+                    # Loaded once by the lock holder: no database read here
+                    cache_stats.incr(name, "hits")
+                    return entry
+        cache_stats.incr(name, "misses")
+    except RedisError:
+        logger.warning("Cache read failed for %s", name, exc_info=True)
+        cache_stats.incr(name, "errors")
+        return await loader()
+
+    try:
+        entry = await loader()
+        if locked and entry is not None:
+            await _store(key, entry, ttl)
+        return entry
+    except RedisError:
+        logger.warning("Cache write failed for %s", name, exc_info=True)
+        cache_stats.incr(name, "errors")
+        return entry
+    finally:
+        if locked:
+            try:
+                await async_redis_client.delete(lock_key)
+            except RedisError:
+                pass
+
+
+async def read_event(db: AsyncSession, event_id: UUID) -> CacheEntry | None:
+    """
+    The cached `EventOut` JSON of one event with its validators, or None if
+    it does not exist.
+    """
+
+    async def load():
+        event = await db.scalar(select(Event).filter_by(id=event_id))
+        if not event:
+            return None
+        body = EventOut.model_validate(event).model_dump_json()
+        return {"body": body, **event_validators(event.updated_at)}
+
+    return await read_through(
+        "event", event_key(event_id), settings.EVENT_CACHE_TTL, load
+    )
@@ -0,0 +1,95 @@
+"""
+Conditional GET: validators derived from `updated_at`, and 304 handling.
+
+A single event's strong ETag is its `updated_at`: every field of `EventOut`
+goes through the ORM, which bumps it (seat counts deliberately don't, and
+they aren't part of the payload). A list page's ETag hashes the (id,
+updated_at) pairs on the page plus the next cursor, so deletions and events
+leaving the upcoming window change it too; its Last-Modified is the newest
+`updated_at` on the page.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from uuid import UUID
+
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+
+Validators = dict[str, str]
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def event_validators(updated_at: datetime) -> Validators:
+    micros = int(updated_at.timestamp() * 1_000_000)
+    return {"etag": f'"{micros:x}"', "last_modified": http_date(updated_at)}
+
+
+def page_validators(
+    rows: Iterable[tuple[UUID, datetime]], next_cursor: str | None
+) -> Validators:
+    digest = hashlib.sha1()
+    newest = None
+    for id, updated_at in rows:
+        digest.update(f"{id}:{updated_at.isoformat()};".encode())
+        newest = updated_at if newest is None else max(newest, updated_at)
+    digest.update((next_cursor or "").encode())
+    return {
+        "etag": f'"{digest.hexdigest()}"',
+        "last_modified": http_date(newest) if newest else "",
+    }
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def not_modified(
+    request: Request, validators: Validators, use_last_modified: bool = True
+) -> bool:
+    """
+    Evaluate If-None-Match, or If-Modified-Since when it is absent (RFC 9110).
+    List pages pass `use_last_modified=False`: a page can change without any
+    of its rows being modified, which only the ETag notices.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = validators.get("etag")
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison, as GET conditionals call for
+        return bool(etag) and bool(tags & {"*", etag, f"W/{etag}"})
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not (use_last_modified and if_modified_since and validators.get("last_modified")):
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+        last_modified = parsedate_to_datetime(validators["last_modified"])
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified <= since
+
+
+def validator_headers(validators: Validators, cache_control: str) -> dict[str, str]:
+    headers = {"Cache-Control": cache_control}
+    if validators.get("etag"):
+        headers[ETAG_HEADER] = validators["etag"]
+    if validators.get("last_modified"):
+        headers[LAST_MODIFIED_HEADER] = validators["last_modified"]
+    return headers
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,4 +1,6 @@
+from collections.abc import AsyncIterator
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, HTTPException
 from fastapi.security import (
@@ -6,30 +8,28 @@ from fastapi.security import (
     HTTPBearer,
 )
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.database.database import SessionLocal
+from app.database.database import AsyncSessionLocal
 from app.models.user import User
+from app.utils.user_cache import UserSnapshot, cache_user, get_cached_user
 
 dbearer_scheme = HTTPBearer(auto_error=False)
 
 
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
 
-def get_current_user(
+async def get_current_user(
     token: Annotated[HTTPAuthorizationCredentials, Depends(dbearer_scheme)],
     db: db_dependency,
-) -> User:
+) -> UserSnapshot:
     jwt_str = token.credentials
 
     try:
@@ -38,13 +38,18 @@ def get_current_user(
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        user_id: str | None = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError as err:
+        user_id = UUID(payload.get("sub") or "")
+    # UUID() raises TypeError/AttributeError for a `sub` that is not a string
+    except (JWTError, ValueError, TypeError, AttributeError) as err:
         raise HTTPException(status_code=401, detail="Invalid token") from err
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await get_cached_user(user_id)
+    if user is None:
+        db_user = await db.get(User, user_id)
+        if db_user:
+            user = UserSnapshot.from_user(db_user)
+            await cache_user(user)
+
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Inactive or non-existent user")
     if not user.is_confirmed:
@@ -52,4 +57,4 @@ def get_current_user(
     return user
 
 
-current_user_dependency = Annotated[User, Depends(get_current_user)]
+current_user_dependency = Annotated[UserSnapshot, Depends(get_current_user)]
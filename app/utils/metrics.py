@@ -0,0 +1,272 @@
+"""
+Prometheus metrics for HTTP requests, SQL statements, Redis commands and
+Celery tasks, exposed at `/metrics`.
+
+`MetricsMiddleware` labels requests by route template, never by raw path,
+and keeps the per-request SQL tally that the engine hooks installed by
+`instrument_engine` add to. The tally is also left on `request.state`
+(`request_stats`) for callers that need it after the response.
+
+Metrics live in the default registry. With PROMETHEUS_MULTIPROC_DIR set (to
+a directory shared by the app and Celery workers on a host),
+prometheus_client records them per process and `/metrics` aggregates every
+process, Celery workers included.
+"""
+
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Requests that match no route share one label instead of one per path
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed while handling a request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements while handling a request",
+    ["method", "route"],
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Execution time of single SQL statements",
+    ["engine"],
+    buckets=(
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5,
+    ),
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Round trip of Redis commands (a pipeline counts as one)",
+    ["client", "command"],
+    buckets=(
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+        0.25, 1,
+    ),
+)
+REDIS_COMMAND_ERRORS = Counter(
+    "redis_command_errors_total",
+    "Redis commands that raised",
+    ["client", "command"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task runtime, by final state",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+CELERY_TASK_RETRIES = Counter(
+    "celery_task_retries_total",
+    "Celery task retries scheduled",
+    ["task"],
+)
+
+
+@dataclass
+class RequestStats:
+    method: str = ""
+    route: str = ""
+    statements: int = 0
+    db_seconds: float = 0.0
+    # Most statements the route may run, set by its `query_budget` dependency
+    query_budget: int | None = None
+    # Executions per statement text, kept only while query profiling is on
+    statement_counts: dict[str, int] | None = None
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def route_label(scope: Scope) -> str:
+    """The template of the route `scope` is dispatched to, e.g. /events/{id}."""
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Request latency, in-flight requests and SQL work per route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_label(scope)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats(method, route)
+        scope.setdefault("state", {})["request_stats"] = stats
+        token = request_stats.set(stats)
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(
+                time.perf_counter() - started
+            )
+            in_flight.dec()
+            request_stats.reset(token)
+            HTTP_REQUEST_DB_STATEMENTS.labels(method, route).observe(stats.statements)
+            HTTP_REQUEST_DB_DURATION.labels(method, route).observe(stats.db_seconds)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Time every statement `engine` runs (for async engines, pass `.sync_engine`)."""
+    statement_duration = DB_STATEMENT_DURATION.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def observe(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        statement_duration.observe(elapsed)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+
+@contextmanager
+def redis_timer(client: str, command: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_COMMAND_ERRORS.labels(client, command).inc()
+        raise
+    finally:
+        REDIS_COMMAND_DURATION.labels(client, command).observe(
+            time.perf_counter() - started
+        )
+
+
+def command_name(args: tuple) -> str:
+    name = args[0] if args else "UNKNOWN"
+    return (name.decode() if isinstance(name, bytes) else str(name)).upper()
+
+
+# Celery task start times, by task id, in the process running the task
+_task_started: dict[str, float] = {}
+
+
+def task_started(task_id: str) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+
+def task_finished(task_name: str, task_id: str, state: str | None) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_DURATION.labels(task_name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+def task_retried(task_name: str) -> None:
+    CELERY_TASK_RETRIES.labels(task_name).inc()
+
+
+class QueueDepthCollector:
+    """Messages waiting in each Celery queue, read from the broker on scrape."""
+
+    def __init__(self, celery_app, queues: Iterable[str]) -> None:
+        self.celery_app = celery_app
+        self.queues = sorted(set(queues))
+
+    def describe(self):
+        # Registering would otherwise call collect(), reaching the broker at
+        # import time
+        return []
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "celery_queue_depth",
+            "Messages waiting in a Celery queue",
+            labels=["queue"],
+        )
+        try:
+            with self.celery_app.connection_for_read() as conn:
+                conn.ensure_connection(max_retries=1)
+                channel = conn.default_channel
+                for queue in self.queues:
+                    try:
+                        _, messages, _ = channel.queue_declare(queue, passive=True)
+                    except conn.channel_errors:
+                        # Not declared yet: nothing was ever sent to it
+                        messages = 0
+                    depth.add_metric([queue], messages)
+        except Exception:
+            logger.warning("Failed to read Celery queue depths", exc_info=True)
+            return
+        yield depth
+
+
+# Collectors evaluated on scrape in the serving process only (multiprocess
+# mode cannot aggregate them across processes)
+scrape_registry = CollectorRegistry(auto_describe=True)
+
+
+def render_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(scrape_registry)
@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(date: datetime, id: UUID) -> str:
+    raw = json.dumps([date.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date), UUID(id)
+    except (ValueError, TypeError) as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from err
@@ -0,0 +1,141 @@
+"""
+Opt-in SQL profiling (QUERY_PROFILING) on top of the per-request tally that
+`MetricsMiddleware` keeps:
+
+- statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their
+  EXPLAIN plan;
+- a statement run N_PLUS_ONE_THRESHOLD times or more in one request is
+  reported as a likely N+1 (typically a lazy relationship loaded once per
+  row). Executions are counted by statement text, so repeats with the same
+  parameters count too.
+
+Query budgets are checked whether profiling is on or not. A route declares
+one with `dependencies=[query_budget(n)]`; a request that runs more
+statements is logged or, with QUERY_BUDGET_ENFORCE (meant for test runs),
+fails with `QueryBudgetExceededError`. The check runs once the response has
+been sent, so the error surfaces in the test run and the server log, never
+in the response the client gets.
+"""
+
+import logging
+import re
+import time
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.utils.metrics import RequestStats, request_stats
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = re.compile(r"\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+class QueryBudgetExceededError(Exception):
+    pass
+
+
+def query_budget(statements: int):
+    """Route dependency: the most SQL statements one request may run."""
+
+    async def set_budget() -> None:
+        stats = request_stats.get()
+        if stats is not None:
+            stats.query_budget = statements
+
+    return Depends(set_budget)
+
+
+def explain(engine: Engine, statement: str, parameters) -> str:
+    """
+    Plan of `statement`, from a connection of its own: a failing EXPLAIN must
+    not abort the transaction of the request being profiled.
+    """
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+        cursor.close()
+        return plan
+    finally:
+        raw.close()
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """Profile `engine` (for async engines, pass `.sync_engine`)."""
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._profiler_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def profile(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._profiler_started
+        stats = request_stats.get()
+        if stats is not None and stats.statement_counts is not None:
+            counts = stats.statement_counts
+            counts[statement] = counts.get(statement, 0) + 1
+        if elapsed < threshold:
+            return
+
+        where = f"{stats.method} {stats.route}" if stats else "outside a request"
+        plan = None
+        if not executemany and EXPLAINABLE.match(statement):
+            try:
+                plan = explain(conn.engine, statement, parameters)
+            except Exception:
+                logger.warning("EXPLAIN of a slow query failed", exc_info=True)
+        logger.warning(
+            "Slow query (%.1f ms, %s):\n%s\n%s",
+            elapsed * 1000,
+            where,
+            statement,
+            plan or "(no plan)",
+        )
+
+
+def check_request(stats: RequestStats) -> None:
+    for statement, count in (stats.statement_counts or {}).items():
+        if count >= settings.N_PLUS_ONE_THRESHOLD:
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d times:\n%s",
+                stats.method,
+                stats.route,
+                count,
+                statement,
+            )
+
+    if stats.query_budget is not None and stats.statements > stats.query_budget:
+        message = (
+            f"{stats.method} {stats.route} ran {stats.statements} SQL "
+            f"statements, over its budget of {stats.query_budget}"
+        )
+        if settings.QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceededError(message)
+        logger.warning(message)
+
+
+class QueryProfilerMiddleware:
+    """
+    Checks each request once it is done, after its response was sent; must
+    run inside MetricsMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = request_stats.get()
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        if settings.QUERY_PROFILING:
+            stats.statement_counts = {}
+        await self.app(scope, receive, send)
+        check_request(stats)
@@ -1,36 +1,181 @@
+import asyncio
+import time
+import uuid
+
 import redis
-from typing import Optional
+import redis.asyncio as aioredis
 
 from app.core.config import settings
+from app.database.pool import PoolStats
+from app.utils.metrics import command_name, redis_timer
+
+
+class InstrumentedRedis(redis.StrictRedis):
+    """Records the latency of every command; a pipeline is timed as a whole."""
+
+    def execute_command(self, *args, **options):
+        with redis_timer("sync", command_name(args)):
+            return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None) -> "InstrumentedPipeline":
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error: bool = True) -> list:
+        with redis_timer("sync", "PIPELINE"):
+            return super().execute(raise_on_error)
+
+
+class InstrumentedAsyncRedis(aioredis.StrictRedis):
+    async def execute_command(self, *args, **options):
+        with redis_timer("async", command_name(args)):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> "InstrumentedAsyncPipeline":
+        return InstrumentedAsyncPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class InstrumentedAsyncPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list:
+        with redis_timer("async", "PIPELINE"):
+            return await super().execute(raise_on_error)
+
+
+redis_client = InstrumentedRedis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+)
 
-redis_client = redis.StrictRedis.from_url(
-    settings.REDIS_URL, decode_responses=True
+
+class InstrumentedBlockingConnectionPool(aioredis.BlockingConnectionPool):
+    """Times how long callers wait for a connection, like the DB pools."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    async def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except redis.ConnectionError as exc:
+            timed_out = isinstance(exc.__cause__, asyncio.TimeoutError)
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - start, timed_out, 0)
+
+    def stats_snapshot(self) -> dict:
+        stats = self.stats.snapshot()
+        del stats["overflow_peak"]
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            **stats,
+        }
+
+
+async_redis_pool = InstrumentedBlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
 )
+async_redis_client = InstrumentedAsyncRedis(connection_pool=async_redis_pool)
 
 VERIFICATION_PREFIX = "email:verification"
 RATE_LIMIT_PREFIX   = "email:rate_limit"
 
-def store_verification_code(email: str, code: str, ttl: int = 600) -> None:
-    key = f"{VERIFICATION_PREFIX}:{email}"
-    redis_client.setex(key, ttl, code)
+# Sliding-window limit on verification emails plus storing the new code, as
+# one atomic step: concurrent requests can't both slip under the limit.
+# The window is a sorted set of send timestamps (server time, in ms).
+# Returns 0 when the code was stored, otherwise milliseconds until the oldest
+# send leaves the window.
+ISSUE_CODE_LUA = """
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+    local window = tonumber(ARGV[2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return math.max(tonumber(oldest[2]) + window - now, 1)
+    end
+    redis.call('ZADD', KEYS[1], now, ARGV[5])
+    redis.call('PEXPIRE', KEYS[1], window)
+    redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[4])
+    return 0
+    """
+
+# Compare-and-delete: a code can be redeemed exactly once, and redeeming it
+# resets the sender's rate limit.
+CONSUME_CODE_LUA = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        redis.call('DEL', KEYS[1], KEYS[2])
+        return 1
+    end
+    return 0
+    """
+
+ISSUE_CODE_SCRIPT = redis_client.register_script(ISSUE_CODE_LUA)
+CONSUME_CODE_SCRIPT = redis_client.register_script(CONSUME_CODE_LUA)
+ASYNC_ISSUE_CODE_SCRIPT = async_redis_client.register_script(ISSUE_CODE_LUA)
+ASYNC_CONSUME_CODE_SCRIPT = async_redis_client.register_script(CONSUME_CODE_LUA)
+
+
+def verification_keys(email: str) -> list[str]:
+    return [f"{RATE_LIMIT_PREFIX}:{email}", f"{VERIFICATION_PREFIX}:{email}"]
+
+
+def _issue_args(code: str) -> list:
+    return [
+        settings.VERIFICATION_SENDS_PER_WINDOW,
+        settings.VERIFICATION_RATE_WINDOW * 1000,
+        code,
+        settings.VERIFICATION_CODE_TTL,
+        uuid.uuid4().hex,
+    ]
+
+
+def issue_verification_code(email: str, code: str) -> float:
+    """
+    Store `code` for `email` unless the sliding-window limit is hit.
+    Returns 0 on success, otherwise the seconds to wait before retrying.
+    """
+    retry_after_ms = ISSUE_CODE_SCRIPT(
+        keys=verification_keys(email), args=_issue_args(code)
+    )
+    return retry_after_ms / 1000
+
 
-def retrieve_verification_code(email: str) -> Optional[str]:
-    key = f"{VERIFICATION_PREFIX}:{email}"
-    return redis_client.get(key)
+async def issue_verification_code_async(email: str, code: str) -> float:
+    retry_after_ms = await ASYNC_ISSUE_CODE_SCRIPT(
+        keys=verification_keys(email), args=_issue_args(code)
+    )
+    return retry_after_ms / 1000
 
-def delete_verification_code(email: str) -> None:
-    key = f"{VERIFICATION_PREFIX}:{email}"
-    redis_client.delete(key)
 
-#Rate limiter
-def is_rate_limited(email: str) -> bool:
-    key = f"{RATE_LIMIT_PREFIX}:{email}"
-    return bool(redis_client.exists(key))
+def consume_verification_code(email: str, code: str) -> bool:
+    """True if `code` matched; the code is deleted and the limit cleared."""
+    rate_limit_key, code_key = verification_keys(email)
+    return bool(CONSUME_CODE_SCRIPT(keys=[code_key, rate_limit_key], args=[code]))
 
-def set_rate_limit(email: str, ttl: int = 600) -> None:
-    key = f"{RATE_LIMIT_PREFIX}:{email}"
-    redis_client.setex(key, ttl, "1")
 
-def clear_rate_limit(email: str) -> None:
-    key = f"{RATE_LIMIT_PREFIX}:{email}"
-    redis_client.delete(key)
\ No newline at end of file
+async def consume_verification_code_async(email: str, code: str) -> bool:
+    rate_limit_key, code_key = verification_keys(email)
+    return bool(
+        await ASYNC_CONSUME_CODE_SCRIPT(keys=[code_key, rate_limit_key], args=[code])
+    )
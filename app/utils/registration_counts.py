@@ -0,0 +1,188 @@
+"""
+Per-event registration counters by status (`registration_counts`).
+
+Every path that inserts registrations or changes their status applies the
+matching deltas with `record_counts` in its own transaction, so counters
+commit or roll back together with the rows they describe. Writes that bypass
+those paths (the admin dashboard, manual SQL) are repaired by
+`reconcile_registration_counts`, which also corrects `events.seats_taken`.
+
+A counter is the sum of up to COUNT_SHARDS rows: each write lands on a
+random shard, so concurrent registrations for one event mostly lock
+different rows instead of queueing on one until commit.
+"""
+
+import logging
+import random
+from collections import Counter
+from collections.abc import Callable
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.event import Event
+from app.models.registration import Registration, RegistrationCount, Status
+
+logger = logging.getLogger(__name__)
+
+COUNT_SHARDS = 8
+
+# (event_id, status) -> change in the number of registrations
+CountDeltas = Counter[tuple[UUID, str]]
+
+
+def moved(event_id: UUID, old: str | None, new: str, n: int = 1) -> CountDeltas:
+    """Deltas for `n` registrations going from `old` (None: new rows) to `new`."""
+    deltas: CountDeltas = Counter()
+    new = Status(new).value
+    old = old and Status(old).value
+    if n and old != new:
+        deltas[event_id, new] += n
+        if old:
+            deltas[event_id, old] -= n
+    return deltas
+
+
+_insert_counts = insert(RegistrationCount)
+# Built once and executed with parameters: constructing a fresh statement on
+# every registration costs more than running it
+COUNTS_UPSERT = _insert_counts.on_conflict_do_update(
+    index_elements=[
+        RegistrationCount.event_id,
+        RegistrationCount.status,
+        RegistrationCount.shard,
+    ],
+    set_={"count": RegistrationCount.count + _insert_counts.excluded.count},
+)
+
+
+def count_rows(deltas: CountDeltas, shard: int | None = None) -> list[dict]:
+    """
+    COUNTS_UPSERT parameters adding `deltas` on one shard (random by default).
+    Rows are in key order so concurrent writers lock them in the same order.
+    """
+    if shard is None:
+        shard = random.randrange(COUNT_SHARDS)
+    return [
+        {"event_id": event_id, "status": status, "shard": shard, "count": n}
+        for (event_id, status), n in sorted(deltas.items())
+        if n
+    ]
+
+
+async def record_counts(db: AsyncSession, deltas: CountDeltas) -> None:
+    if rows := count_rows(deltas):
+        # Pending registrations are inserted first, so their event is already
+        # KEY SHARE locked (see reconcile) before any counter row is
+        await db.flush()
+        # Core execution: the ORM bulk-insert path adds noticeable overhead
+        connection = await db.connection()
+        await connection.execute(COUNTS_UPSERT, rows)
+
+
+async def registration_counts(db: AsyncSession, event_id: UUID) -> dict[str, int]:
+    """Counters of one event, summed over at most COUNT_SHARDS rows per status."""
+    result = await db.execute(
+        select(RegistrationCount.status, func.sum(RegistrationCount.count))
+        .filter_by(event_id=event_id)
+        .group_by(RegistrationCount.status)
+    )
+    return {status: int(n) for status, n in result.all()}
+
+
+def _recount(db: Session, event_ids: list[UUID]) -> CountDeltas:
+    """Registrations of `event_ids` by event and status, counted from the rows."""
+    return Counter(
+        {
+            (event_id, status): n
+            for event_id, status, n in db.execute(
+                select(Registration.event_id, Registration.status, func.count())
+                .filter(Registration.event_id.in_(event_ids))
+                .group_by(Registration.event_id, Registration.status)
+            )
+        }
+    )
+
+
+def _reconcile_counts(db: Session, actual: CountDeltas, event_ids: list[UUID]) -> int:
+    stored = {
+        (event_id, status): n
+        for event_id, status, n in db.execute(
+            select(
+                RegistrationCount.event_id,
+                RegistrationCount.status,
+                func.sum(RegistrationCount.count),
+            )
+            .filter(RegistrationCount.event_id.in_(event_ids))
+            .group_by(RegistrationCount.event_id, RegistrationCount.status)
+        )
+    }
+    drift: CountDeltas = Counter()
+    for key in actual.keys() | stored.keys():
+        drift[key] = actual.get(key, 0) - stored.get(key, 0)
+    if rows := count_rows(drift, shard=0):
+        db.execute(COUNTS_UPSERT, rows)
+    return len(rows)
+
+
+def _reconcile_seats(
+    db: Session, actual: CountDeltas, event_ids: list[UUID]
+) -> list[UUID]:
+    """Set `seats_taken` to the accepted registrations wherever it drifted."""
+    repaired = []
+    for event_id, seats_taken in db.execute(
+        select(Event.id, Event.seats_taken).filter(Event.id.in_(event_ids))
+    ):
+        if (seats := actual[event_id, Status.ACCEPTED.value]) != seats_taken:
+            # Seat counts are not part of the event payload: keep updated_at
+            db.execute(
+                update(Event)
+                .where(Event.id == event_id)
+                .values(seats_taken=seats, updated_at=Event.updated_at)
+            )
+            repaired.append(event_id)
+    return repaired
+
+
+def reconcile_registration_counts(
+    batch_size: int, reset_seat_counter: Callable[[UUID], None] | None = None
+) -> int:
+    """
+    Recount registrations event by event and correct counters that drifted
+    (the difference goes to shard 0) as well as `seats_taken`, returning how
+    many were repaired. `reset_seat_counter` is called, after commit, for
+    every event whose `seats_taken` changed.
+
+    Each batch of events is locked FOR UPDATE first. Status changes take the
+    same lock and inserting a registration takes a KEY SHARE lock on its
+    event through the foreign key, so no writer can commit between the
+    recount and the repair.
+    """
+    repaired = 0
+    last_id = None
+    while True:
+        with SessionLocal() as db:
+            query = select(Event.id).order_by(Event.id).limit(batch_size)
+            if last_id is not None:
+                query = query.filter(Event.id > last_id)
+            event_ids = db.scalars(query.with_for_update()).all()
+            if not event_ids:
+                break
+            actual = _recount(db, event_ids)
+            fixed = _reconcile_counts(db, actual, event_ids)
+            seats_fixed = _reconcile_seats(db, actual, event_ids)
+            db.commit()
+        if fixed:
+            logger.warning("Repaired %d drifted registration counters", fixed)
+        if seats_fixed:
+            logger.warning("Repaired seats_taken of %d events", len(seats_fixed))
+            if reset_seat_counter is not None:
+                for event_id in seats_fixed:
+                    reset_seat_counter(event_id)
+        repaired += fixed + len(seats_fixed)
+        last_id = event_ids[-1]
+    return repaired
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import uuid
+from collections.abc import Iterator
+from typing import BinaryIO
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app.models.registration import Status
+from app.schemas.registration import ImportRowError, RegistrationCreate
+
+CSV_MEDIA_TYPE = "text/csv"
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+IMPORT_COLUMNS = ["id", "event_id", "status", "name", "surname", "phone", "email"]
+MAX_REPORTED_ERRORS = 1000
+
+
+class InvalidUploadError(ValueError):
+    """The upload as a whole cannot be read, e.g. it is not UTF-8."""
+
+
+class ImportReport:
+    def __init__(self) -> None:
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[ImportRowError] = []
+
+    def add_error(self, row: int, errors: list[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(row=row, errors=errors))
+
+
+def _read_csv(file: BinaryIO) -> Iterator[tuple[int, dict]]:
+    """
+    The file is decoded in chunks and a CSV row may span lines, so a decoding
+    error cannot be pinned to one row: the whole upload is rejected.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    try:
+        for row_number, row in enumerate(reader, start=2):
+            # Empty cells mean "not provided" for the optional columns
+            yield row_number, {key: value or None for key, value in row.items() if key}
+    except UnicodeDecodeError as err:
+        raise InvalidUploadError("File is not valid UTF-8") from err
+
+
+def _read_ndjson(file: BinaryIO) -> Iterator[tuple[int, dict | None]]:
+    """Lines are decoded one by one, so a bad line is just an invalid row."""
+    for row_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            data = None
+        yield row_number, data if isinstance(data, dict) else None
+
+
+def detect_media_type(content_type: str | None, filename: str | None) -> str | None:
+    content_type = (content_type or "").split(";")[0].strip()
+    filename = (filename or "").lower()
+    if content_type == CSV_MEDIA_TYPE or filename.endswith(".csv"):
+        return CSV_MEDIA_TYPE
+    if content_type in NDJSON_MEDIA_TYPES or filename.endswith((".ndjson", ".jsonl")):
+        return NDJSON_MEDIA_TYPES[0]
+    return None
+
+
+def validated_records(
+    file: BinaryIO, media_type: str, event_id: UUID, report: ImportReport
+) -> Iterator[tuple]:
+    """
+    Lazily parse and validate an uploaded CSV/NDJSON file, yielding rows in
+    IMPORT_COLUMNS order. Invalid rows are recorded in `report` and skipped.
+    """
+    rows = _read_csv(file) if media_type == CSV_MEDIA_TYPE else _read_ndjson(file)
+    for row_number, data in rows:
+        if data is None:
+            report.add_error(row_number, ["Invalid JSON object or not UTF-8"])
+            continue
+        try:
+            payload = RegistrationCreate.model_validate(data)
+        except ValidationError as err:
+            report.add_error(
+                row_number,
+                [
+                    f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                    for error in err.errors()
+                ],
+            )
+            continue
+        report.imported += 1
+        yield (
+            uuid.uuid4(),
+            event_id,
+            Status.WAITLIST.value,
+            payload.name,
+            payload.surname,
+            payload.phone,
+            payload.email,
+        )
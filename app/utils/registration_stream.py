@@ -0,0 +1,261 @@
+"""
+Write-behind ingestion for public registrations.
+
+With REGISTRATION_WRITE_BEHIND enabled, `register_for_event` appends the
+validated registration to a Redis Stream and answers right away with the id
+the row will get. `flush_registrations` (a Celery beat task) drains the stream
+through a consumer group and writes each batch with one multi-row
+INSERT ... ON CONFLICT DO NOTHING, so redelivered entries are harmless.
+Entries are acknowledged and deleted only after the batch commits.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+from redis import ResponseError
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.event import Event
+from app.models.registration import Registration, Status
+from app.schemas.registration import RegistrationCreate
+from app.utils.redis import async_redis_client, redis_client
+from app.utils.registration_counts import COUNTS_UPSERT, count_rows, moved
+from app.utils.seats import reset_seat_counter
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "registrations:stream"
+STREAM_GROUP = "registration-writers"
+STREAM_STATS_KEY = "registrations:stream:stats"
+# Entries a consumer has held this long are assumed orphaned and re-claimed
+CLAIM_IDLE_MS = 60_000
+# Upper bound on batches per flush run, so one task never runs unbounded
+MAX_BATCHES_PER_FLUSH = 20
+
+
+async def enqueue_registration(event_id: UUID, payload: RegistrationCreate) -> UUID:
+    """Queue a registration and return the id its row will be inserted with."""
+    registration_id = uuid4()
+    await async_redis_client.xadd(
+        STREAM_KEY,
+        {
+            "id": str(registration_id),
+            "event_id": str(event_id),
+            "payload": payload.model_dump_json(),
+        },
+    )
+    return registration_id
+
+
+def _create_group() -> None:
+    try:
+        redis_client.xgroup_create(STREAM_KEY, STREAM_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def _entry_time(entry_id: str) -> datetime:
+    # Stream ids are "<milliseconds>-<sequence>"
+    return datetime.fromtimestamp(int(entry_id.split("-")[0]) / 1000, UTC)
+
+
+def _read_batch(consumer: str, count: int) -> list[tuple[str, dict]]:
+    try:
+        return _claim_or_read(consumer, count)
+    except ResponseError as exc:
+        if "NOGROUP" not in str(exc):
+            raise
+    _create_group()
+    return _claim_or_read(consumer, count)
+
+
+def _claim_or_read(consumer: str, count: int) -> list[tuple[str, dict]]:
+    """Orphaned entries of crashed consumers first, then new ones."""
+    _, claimed, *_ = redis_client.xautoclaim(
+        STREAM_KEY, STREAM_GROUP, consumer, CLAIM_IDLE_MS, count=count
+    )
+    entries = [(entry_id, fields) for entry_id, fields in claimed if fields]
+    if entries:
+        return entries
+    response = redis_client.xreadgroup(
+        STREAM_GROUP, consumer, {STREAM_KEY: ">"}, count=count
+    )
+    return response[0][1] if response else []
+
+
+def _batch_rows(entries: list[tuple[str, dict]]) -> list[dict]:
+    return [
+        {
+            "id": UUID(fields["id"]),
+            "event_id": UUID(fields["event_id"]),
+            "status": Status.WAITLIST,
+            "created_at": _entry_time(entry_id),
+            **json.loads(fields["payload"]),
+        }
+        for entry_id, fields in entries
+    ]
+
+
+def _lock_events(db: Session, event_ids: set[UUID]) -> dict[UUID, Event]:
+    return {
+        event.id: event
+        for event in db.scalars(
+            select(Event)
+            .where(Event.id.in_(event_ids))
+            .order_by(Event.id)
+            .with_for_update()
+        )
+    }
+
+
+def _insert_new(db: Session, rows: list[dict]) -> list[dict]:
+    """Insert `rows`, returning those not already written by an earlier delivery."""
+    if not rows:
+        return []
+    inserted = set(
+        db.scalars(
+            insert(Registration)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Registration.id])
+            .returning(Registration.id)
+        )
+    )
+    return [row for row in rows if row["id"] in inserted]
+
+
+def _accept_in_order(
+    db: Session, events: dict[UUID, Event], rows: list[dict]
+) -> dict[UUID, int]:
+    """
+    Accept new registrations of capacity-limited events, in stream order,
+    while seats last; returns the seats taken per event.
+    """
+    accepted: dict[UUID, list[UUID]] = {}
+    for row in rows:
+        event = events[row["event_id"]]
+        if event.capacity is None:
+            continue
+        seats = accepted.setdefault(event.id, [])
+        if event.seats_taken + len(seats) < event.capacity:
+            seats.append(row["id"])
+
+    taken = {}
+    for event_id, ids in accepted.items():
+        if not ids:
+            continue
+        db.execute(
+            update(Registration)
+            .where(Registration.id.in_(ids))
+            .values(status=Status.ACCEPTED)
+        )
+        db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(
+                seats_taken=Event.seats_taken + len(ids),
+                updated_at=Event.updated_at,
+            )
+        )
+        taken[event_id] = len(ids)
+    return taken
+
+
+def _write_batch(db: Session, entries: list[tuple[str, dict]]) -> dict[str, int]:
+    """
+    Insert one batch and hand out seats of capacity-limited events in stream
+    order. Event rows are locked (in id order) for the duration, which keeps
+    them from being deleted mid-batch and serializes seat changes with the
+    status endpoints.
+    """
+    rows = _batch_rows(entries)
+    events = _lock_events(db, {row["event_id"] for row in rows})
+    # Events deleted since the registration was queued
+    valid = [row for row in rows if row["event_id"] in events]
+    inserted = _insert_new(db, valid)
+    taken = _accept_in_order(db, events, inserted)
+
+    transitions = Counter()
+    for row in inserted:
+        transitions.update(moved(row["event_id"], None, Status.WAITLIST))
+    for event_id, n in taken.items():
+        transitions.update(moved(event_id, Status.WAITLIST, Status.ACCEPTED, n))
+    if count_changes := count_rows(transitions):
+        db.execute(COUNTS_UPSERT, count_changes)
+    db.commit()
+
+    for event_id in taken:
+        reset_seat_counter(event_id)
+    return {
+        "flushed": len(inserted),
+        "duplicates": len(valid) - len(inserted),
+        "dropped": len(rows) - len(valid),
+    }
+
+
+def flush_registrations(batch_size: int) -> int:
+    """Drain the stream into `registrations`, returning the rows inserted."""
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    total = 0
+    for _ in range(MAX_BATCHES_PER_FLUSH):
+        entries = _read_batch(consumer, batch_size)
+        if not entries:
+            break
+        with SessionLocal() as db:
+            counts = _write_batch(db, entries)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        with redis_client.pipeline() as pipe:
+            pipe.xack(STREAM_KEY, STREAM_GROUP, *entry_ids)
+            pipe.xdel(STREAM_KEY, *entry_ids)
+            for field, value in counts.items():
+                pipe.hincrby(STREAM_STATS_KEY, field, value)
+            pipe.hincrby(STREAM_STATS_KEY, "batches", 1)
+            pipe.hset(STREAM_STATS_KEY, "last_flush_at", time.time())
+            pipe.execute()
+        if counts["dropped"]:
+            logger.warning(
+                "Dropped %d queued registrations for deleted events",
+                counts["dropped"],
+            )
+        total += counts["flushed"]
+    return total
+
+
+def stream_stats() -> dict:
+    """
+    Backlog (entries not yet written, including ones being flushed), lag
+    (age of the oldest of them) and cumulative flush counters.
+    """
+    backlog = redis_client.xlen(STREAM_KEY)
+    oldest = redis_client.xrange(STREAM_KEY, count=1)
+    stats = redis_client.hgetall(STREAM_STATS_KEY)
+    pending = 0
+    if backlog:
+        for group in redis_client.xinfo_groups(STREAM_KEY):
+            if group["name"] == STREAM_GROUP:
+                pending = group["pending"]
+    lag = 0.0
+    if oldest:
+        lag = (datetime.now(UTC) - _entry_time(oldest[0][0])).total_seconds()
+    return {
+        "backlog": backlog,
+        "pending": pending,
+        "lag_seconds": round(max(lag, 0.0), 3),
+        "batches": int(stats.get("batches", 0)),
+        "flushed": int(stats.get("flushed", 0)),
+        "duplicates": int(stats.get("duplicates", 0)),
+        "dropped": int(stats.get("dropped", 0)),
+        "last_flush_at": float(stats["last_flush_at"])
+        if "last_flush_at" in stats
+        else None,
+    }
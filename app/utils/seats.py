@@ -0,0 +1,177 @@
+import logging
+from uuid import UUID
+
+from redis import RedisError
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.event import Event
+from app.models.registration import Registration, Status
+from app.utils.redis import async_redis_client, redis_client
+from app.utils.registration_counts import moved, record_counts
+
+logger = logging.getLogger(__name__)
+
+SEATS_PREFIX = "event:seats"
+SEATS_TTL = 3600
+
+# Add ARGV[1] to the counter, but only if it is seeded: a counter that was
+# reset must be re-seeded from Postgres, not recreated from an offset.
+# Returns the new value, or nil when the counter is missing.
+ADJUST_SEATS_LUA = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('INCRBY', KEYS[1], ARGV[1])
+    end
+    return false
+    """
+
+ADJUST_SEATS_SCRIPT = async_redis_client.register_script(ADJUST_SEATS_LUA)
+
+
+def seats_key(event_id: UUID) -> str:
+    return f"{SEATS_PREFIX}:{event_id}"
+
+
+def reset_seat_counter(event_id: UUID) -> None:
+    """Drop the Redis counter so it is re-seeded from Postgres on next use."""
+    try:
+        redis_client.delete(seats_key(event_id))
+    except RedisError:
+        logger.warning("Failed to reset seat counter for %s", event_id, exc_info=True)
+
+
+async def reset_seat_counter_async(event_id: UUID) -> None:
+    try:
+        await async_redis_client.delete(seats_key(event_id))
+    except RedisError:
+        logger.warning("Failed to reset seat counter for %s", event_id, exc_info=True)
+
+
+async def committed_free_seats(db: AsyncSession, event_id: UUID) -> int:
+    """Free seats as last committed; a plain read, it never waits on row locks."""
+    free = await db.scalar(
+        select(Event.capacity - Event.seats_taken).filter_by(id=event_id)
+    )
+    return free or 0
+
+
+async def _counter_has_seat(db: AsyncSession, event_id: UUID) -> bool:
+    """
+    Fast path: take one seat from a Redis counter of remaining seats, seeded
+    from the committed `seats_taken` when missing. It only ever says "maybe";
+    Postgres makes the final call.
+    """
+    key = seats_key(event_id)
+    try:
+        remaining = await ADJUST_SEATS_SCRIPT(keys=[key], args=[-1])
+        if remaining is None:
+            free = await committed_free_seats(db, event_id)
+            async with async_redis_client.pipeline() as pipe:
+                pipe.set(key, free, nx=True, ex=SEATS_TTL)
+                pipe.decr(key)
+                _, remaining = await pipe.execute()
+    except RedisError:
+        logger.warning("Seat counter unavailable for %s", event_id, exc_info=True)
+        return True
+    return remaining >= 0
+
+
+async def return_counter_seat(event_id: UUID) -> None:
+    """Give back the counter seat of a registration that was not committed."""
+    try:
+        await ADJUST_SEATS_SCRIPT(keys=[seats_key(event_id)], args=[1])
+    except RedisError:
+        logger.warning("Seat counter unavailable for %s", event_id, exc_info=True)
+
+
+async def allocate_seat(db: AsyncSession, event: Event) -> bool:
+    """
+    Atomically take one seat of a capacity-limited event, if any is left.
+
+    A full counter lets registrations skip the row update, but it is checked
+    against the committed seats first. A counter that fell behind Postgres
+    (e.g. a seat freed while it was being re-seeded) is dropped instead of
+    waitlisting everyone until it expires. Callers must hand the counter seat
+    back with `return_counter_seat` if their transaction does not commit.
+    """
+    if not await _counter_has_seat(db, event.id):
+        if await committed_free_seats(db, event.id) <= 0:
+            return False
+        await reset_seat_counter_async(event.id)
+    seats_taken = await db.scalar(
+        update(Event)
+        .where(Event.id == event.id, Event.seats_taken < Event.capacity)
+        .values(seats_taken=Event.seats_taken + 1, updated_at=Event.updated_at)
+        .returning(Event.seats_taken)
+    )
+    return seats_taken is not None
+
+
+async def lock_event(db: AsyncSession, event_id: UUID) -> Event | None:
+    """
+    Lock the event row for a seat-changing transition. Every such transition
+    takes this lock first, so seat counts never race.
+    """
+    return await db.scalar(
+        select(Event)
+        .filter_by(id=event_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+
+
+async def adjust_seats(db: AsyncSession, event: Event, delta: int) -> None:
+    if not delta:
+        return
+    # Seat counts are not part of the event payload, so leave updated_at alone
+    seats_taken = await db.scalar(
+        update(Event)
+        .where(Event.id == event.id)
+        .values(seats_taken=Event.seats_taken + delta, updated_at=Event.updated_at)
+        .returning(Event.seats_taken)
+    )
+    set_committed_value(event, "seats_taken", seats_taken)
+
+
+def free_seats(event: Event) -> int:
+    if event.capacity is None:
+        return 0
+    return max(event.capacity - event.seats_taken, 0)
+
+
+async def promote_waitlisted(
+    db: AsyncSession, event: Event, seats: int
+) -> list[Registration]:
+    """
+    Hand up to `seats` free seats to the longest-waiting registrations.
+    Rows locked by a concurrent transition are skipped rather than waited on.
+    """
+    if seats <= 0:
+        return []
+    result = await db.scalars(
+        select(Registration)
+        .filter_by(event_id=event.id, status=Status.WAITLIST)
+        .order_by(Registration.created_at.asc(), Registration.id.asc())
+        .limit(seats)
+        .with_for_update(skip_locked=True)
+    )
+    promoted = result.all()
+    for registration in promoted:
+        registration.status = Status.ACCEPTED
+    await adjust_seats(db, event, len(promoted))
+    await record_counts(
+        db, moved(event.id, Status.WAITLIST, Status.ACCEPTED, len(promoted))
+    )
+    return promoted
+
+
+async def count_by_status(
+    db: AsyncSession, event_id: UUID, ids: list[UUID]
+) -> dict[str, int]:
+    result = await db.execute(
+        select(Registration.status, func.count())
+        .filter(Registration.event_id == event_id, Registration.id.in_(ids))
+        .group_by(Registration.status)
+    )
+    return dict(result.all())
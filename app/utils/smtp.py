@@ -0,0 +1,134 @@
+import logging
+import os
+import smtplib
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from email.message import Message
+from queue import Empty, LifoQueue
+from threading import Lock
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PooledSMTP:
+    """An authenticated SMTP session plus the bookkeeping the pool needs."""
+
+    def __init__(self, smtp: smtplib.SMTP) -> None:
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.sent = 0
+
+    def send(self, message: Message) -> None:
+        self.smtp.send_message(message)
+        self.sent += 1
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+def connect() -> PooledSMTP:
+    smtp = smtplib.SMTP(
+        settings.SMTP_SERVER, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT
+    )
+    try:
+        if settings.SMTP_STARTTLS:
+            smtp.starttls()
+        if settings.EMAIL_PASSWORD:
+            smtp.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
+    except BaseException:
+        smtp.close()
+        raise
+    return PooledSMTP(smtp)
+
+
+class SMTPPool:
+    """
+    Per-process pool of logged-in SMTP sessions, so a worker pays for the
+    connect/STARTTLS/AUTH round trips once instead of once per email.
+
+    Sessions idle for longer than `healthcheck_interval` are probed with NOOP
+    before reuse, sessions that raised are discarded, and a session is retired
+    after `max_messages` to stay under the server's per-session limits.
+    Pools inherited across fork are dropped, not shared with the parent.
+    """
+
+    def __init__(
+        self, size: int, max_messages: int, healthcheck_interval: float
+    ) -> None:
+        self.size = size
+        self.max_messages = max_messages
+        self.healthcheck_interval = healthcheck_interval
+        self._lock = Lock()
+        self._pid = os.getpid()
+        self._idle: LifoQueue[PooledSMTP] = LifoQueue()
+
+    def _reset_after_fork(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # The sockets belong to the parent; just forget them
+                self._idle = LifoQueue()
+                self._pid = os.getpid()
+
+    def _healthy(self, conn: PooledSMTP) -> bool:
+        if time.monotonic() - conn.last_used < self.healthcheck_interval:
+            return True
+        try:
+            return conn.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _checkout(self) -> PooledSMTP:
+        self._reset_after_fork()
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                return connect()
+            if self._healthy(conn):
+                return conn
+            logger.info("Dropping stale SMTP connection")
+            conn.close()
+
+    def _checkin(self, conn: PooledSMTP) -> None:
+        if conn.sent >= self.max_messages or self._idle.qsize() >= self.size:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledSMTP]:
+        conn = self._checkout()
+        try:
+            yield conn
+        except BaseException:
+            # The session may be mid-transaction or dead; never reuse it
+            conn.close()
+            raise
+        self._checkin(conn)
+
+    def send(self, message: Message) -> None:
+        with self.connection() as conn:
+            conn.send(message)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
+
+
+smtp_pool = SMTPPool(
+    size=settings.SMTP_POOL_SIZE,
+    max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+    healthcheck_interval=settings.SMTP_HEALTHCHECK_INTERVAL,
+)
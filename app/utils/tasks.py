@@ -1,15 +1,27 @@
+import asyncio
+import logging
 import random
 import smtplib
 from email.mime.text import MIMEText
 
 from celery import Celery
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_process_shutdown,
+)
 
 from app.core.config import settings
-from app.utils.redis import (
-    store_verification_code,
-    is_rate_limited,
-    set_rate_limit,
-)
+from app.utils.analytics import rollup_registrations
+from app.utils.metrics import task_finished, task_retried, task_started
+from app.utils.redis import issue_verification_code_async
+from app.utils.registration_counts import reconcile_registration_counts
+from app.utils.registration_stream import flush_registrations
+from app.utils.seats import reset_seat_counter
+from app.utils.smtp import smtp_pool
+
+logger = logging.getLogger(__name__)
 
 celery_app = Celery(
     __name__,
@@ -19,6 +31,26 @@ celery_app = Celery(
 
 celery_app.conf.task_routes = {
     "app.utils.tasks.send_email_verification": {"queue": "emails"},
+    "app.utils.tasks.send_email_verifications": {"queue": "emails"},
+}
+
+celery_app.conf.beat_schedule = {
+    "flush-registration-stream": {
+        "task": "app.utils.tasks.flush_registration_stream",
+        "schedule": settings.REGISTRATION_FLUSH_INTERVAL,
+        # A run that missed its slot is superseded by the next one
+        "options": {"expires": settings.REGISTRATION_FLUSH_INTERVAL * 5},
+    },
+    "reconcile-registration-counts": {
+        "task": "app.utils.tasks.reconcile_registration_counts_task",
+        "schedule": settings.REGISTRATION_COUNTS_RECONCILE_INTERVAL,
+        "options": {"expires": settings.REGISTRATION_COUNTS_RECONCILE_INTERVAL},
+    },
+    "rollup-registration-analytics": {
+        "task": "app.utils.tasks.rollup_registration_analytics",
+        "schedule": settings.ANALYTICS_ROLLUP_INTERVAL,
+        "options": {"expires": settings.ANALYTICS_ROLLUP_INTERVAL},
+    },
 }
 
 
@@ -27,9 +59,36 @@ def generate_verification_code(length: int = 6) -> str:
     return f"{random.randint(10**(length-1), 10**length - 1)}"
 
 
-@celery_app.task(bind=True, max_retries=3)
-def send_email_verification(self, to_email: str, code: str) -> None:
-    
+@worker_process_shutdown.connect
+def close_smtp_pool(**kwargs) -> None:
+    smtp_pool.close()
+
+
+@task_prerun.connect
+def record_task_start(task_id: str, **kwargs) -> None:
+    task_started(task_id)
+
+
+@task_postrun.connect
+def record_task_runtime(
+    task_id: str, task, state: str | None = None, **kwargs
+) -> None:
+    task_finished(task.name, task_id, state)
+
+
+@task_retry.connect
+def record_task_retry(sender, **kwargs) -> None:
+    task_retried(sender.name)
+
+
+def celery_queues() -> set[str]:
+    """The default queue and every queue tasks are routed to."""
+    return {celery_app.conf.task_default_queue} | {
+        route["queue"] for route in celery_app.conf.task_routes.values()
+    }
+
+
+def verification_message(to_email: str, code: str) -> MIMEText:
     subject = "Your Verification Code"
     body = (
         f"Hello,\n\n"
@@ -40,24 +99,74 @@ def send_email_verification(self, to_email: str, code: str) -> None:
     msg["Subject"] = subject
     msg["From"] = f"{settings.EMAIL_SENDER_NAME} <{settings.EMAIL_ADDRESS}>"
     msg["To"] = to_email
+    return msg
 
+
+@celery_app.task(bind=True, max_retries=3)
+def send_email_verification(self, to_email: str, code: str) -> None:
     try:
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
-            server.sendmail(settings.EMAIL_ADDRESS, to_email, msg.as_string())
+        smtp_pool.send(verification_message(to_email, code))
     except Exception as exc:
-   
         countdown = 60 * (2 ** self.request.retries)
         raise self.retry(exc=exc, countdown=countdown)
 
 
-def send_verification_email_task(to_email: str) -> str:
-    if is_rate_limited(to_email):
-        raise Exception("Please wait before requesting another code.")
+@celery_app.task(bind=True, max_retries=3)
+def send_email_verifications(self, messages: list[tuple[str, str]]) -> None:
+    """
+    Send many (email, code) pairs over pooled sessions, up to
+    SMTP_MAX_MESSAGES_PER_CONNECTION per session. Refused recipients are
+    skipped; if a session fails, only the unsent remainder is retried.
+    """
+    sent = 0
+    try:
+        while sent < len(messages):
+            with smtp_pool.connection() as conn:
+                while (
+                    sent < len(messages)
+                    and conn.sent < settings.SMTP_MAX_MESSAGES_PER_CONNECTION
+                ):
+                    to_email, code = messages[sent]
+                    try:
+                        conn.send(verification_message(to_email, code))
+                    except smtplib.SMTPRecipientsRefused:
+                        logger.warning("Recipient refused: %s", to_email)
+                    sent += 1
+    except (smtplib.SMTPException, OSError) as exc:
+        countdown = 60 * (2 ** self.request.retries)
+        raise self.retry(
+            args=(messages[sent:],), exc=exc, countdown=countdown
+        ) from exc
+
+
+@celery_app.task(ignore_result=True)
+def flush_registration_stream() -> int:
+    return flush_registrations(settings.REGISTRATION_FLUSH_BATCH_SIZE)
+
+
+@celery_app.task(ignore_result=True)
+def rollup_registration_analytics() -> int:
+    return rollup_registrations(settings.ANALYTICS_ROLLUP_LAG)
+
+
+@celery_app.task(ignore_result=True)
+def reconcile_registration_counts_task() -> int:
+    return reconcile_registration_counts(
+        settings.REGISTRATION_COUNTS_RECONCILE_BATCH_SIZE, reset_seat_counter
+    )
+
+
+class VerificationRateLimitedError(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Please wait before requesting another code.")
+        self.retry_after = retry_after
+
 
+async def send_verification_email_task_async(to_email: str) -> str:
     code = generate_verification_code()
-    store_verification_code(to_email, code)  
-    send_email_verification.delay(to_email, code) 
-    set_rate_limit(to_email)  
-    return code
\ No newline at end of file
+    retry_after = await issue_verification_code_async(to_email, code)
+    if retry_after:
+        raise VerificationRateLimitedError(retry_after)
+    # Publishing to the broker is blocking I/O
+    await asyncio.to_thread(send_email_verification.delay, to_email, code)
+    return code
@@ -0,0 +1,122 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from threading import Lock
+from uuid import UUID
+
+from redis import RedisError
+
+from app.core.config import settings
+from app.models.user import User
+from app.utils.redis import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_PREFIX = "cache:user"
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """The subset of `User` that authenticated endpoints rely on."""
+
+    id: UUID
+    email: str
+    is_active: bool
+    is_confirmed: bool
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_confirmed=user.is_confirmed,
+            is_admin=user.is_admin,
+        )
+
+    def dumps(self) -> str:
+        return json.dumps({**asdict(self), "id": str(self.id)}, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, raw: str) -> "UserSnapshot":
+        data = json.loads(raw)
+        return cls(**{**data, "id": UUID(data["id"])})
+
+
+class TTLCache:
+    """A small thread-safe LRU whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = Lock()
+        self._data: OrderedDict[UUID, tuple[float, UserSnapshot]] = OrderedDict()
+
+    def get(self, key: UUID) -> UserSnapshot | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: UUID, value: UserSnapshot) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: UUID) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# Other workers only learn about invalidations through Redis, so the local
+# TTL bounds how long they may keep serving a stale snapshot.
+local_users = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_LOCAL_TTL)
+
+
+def user_key(user_id: UUID) -> str:
+    return f"{USER_CACHE_PREFIX}:{user_id}"
+
+
+async def get_cached_user(user_id: UUID) -> UserSnapshot | None:
+    snapshot = local_users.get(user_id)
+    if snapshot is not None:
+        return snapshot
+    try:
+        raw = await async_redis_client.get(user_key(user_id))
+    except RedisError:
+        logger.warning("User cache read failed", exc_info=True)
+        return None
+    if raw is None:
+        return None
+    snapshot = UserSnapshot.loads(raw)
+    local_users.set(user_id, snapshot)
+    return snapshot
+
+
+async def cache_user(snapshot: UserSnapshot) -> None:
+    local_users.set(snapshot.id, snapshot)
+    try:
+        await async_redis_client.setex(
+            user_key(snapshot.id), settings.USER_CACHE_REDIS_TTL, snapshot.dumps()
+        )
+    except RedisError:
+        logger.warning("User cache write failed", exc_info=True)
+
+
+async def invalidate_user(user_id: UUID) -> None:
+    local_users.pop(user_id)
+    try:
+        await async_redis_client.delete(user_key(user_id))
+    except RedisError:
+        logger.warning("Failed to invalidate cached user %s", user_id, exc_info=True)
@@ -0,0 +1,331 @@
+"""
+Populate `users`, `events` and `registrations` at production scale.
+
+Rows are generated from `--seed` (and `--anchor`, the date event and
+sign-up times are laid out around, today by default), so the same
+arguments always produce the same data, ids included. They are streamed
+straight into binary COPY, so memory holds the generated ids but never the
+rows themselves:
+
+  users          confirmed accounts sharing one password, hashed once with
+                 the app's Argon2 parameters; the first `--organizers` own
+                 the events
+  events         spread from ~6 months ago to a year ahead, a third with a
+                 capacity; popularity is heavy-tailed, as in production
+  registrations  drawn against event popularity, signed up before the event;
+                 accepted only while a capacity-limited event has seats
+
+Creation and update times all fall before the anchor, even for upcoming
+events, so no row looks changed in the future to the analytics rollups.
+
+Everything is loaded in one transaction, together with the matching
+`registration_counts` rows and `events.seats_taken`, so the counters and the
+capacity check hold without a reconcile. The analytics watermark is reset so
+the next rollup run covers the new rows. Loading the same seed twice clashes
+on ids and emails: use `--truncate` to empty the three tables (and
+everything referencing them) first, on a database you can throw away.
+
+    python -m benchmarks.datagen --users 200000 --events 500000 \\
+        --registrations 20000000 --seed 7
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import delete, text
+
+from app.database.database import async_engine
+from app.models.analytics import RollupWatermark
+from app.models.registration import Status
+from app.utils.analytics import WATERMARK
+from app.utils.cache import invalidate_event_lists
+from app.utils.password import hash_password
+from benchmarks.event_search import CITIES, WORDS
+
+USER_COLUMNS = [
+    "id", "email", "password_hash", "is_active", "is_confirmed", "is_admin",
+    "created_at", "updated_at",
+]
+EVENT_COLUMNS = [
+    "id", "title", "description", "location", "date", "share_uuid",
+    "is_public", "capacity", "seats_taken", "organizer_id", "created_at",
+    "updated_at",
+]
+REGISTRATION_COLUMNS = [
+    "id", "name", "surname", "phone", "email", "status", "event_id",
+    "created_at", "updated_at",
+]
+COUNT_COLUMNS = ["event_id", "status", "shard", "count"]
+
+FIRST_NAMES = [
+    "Anna", "Piotr", "Maria", "Jan", "Katarzyna", "Tomasz", "Agnieszka",
+    "Pawel", "Magdalena", "Michal", "Ewa", "Krzysztof", "Julia", "Adam",
+    "Zofia", "Marek", "Natalia", "Lukasz", "Olga", "Jakub",
+]
+LAST_NAMES = [
+    "Nowak", "Kowalski", "Wisniewski", "Wojcik", "Kowalczyk", "Kaminski",
+    "Lewandowski", "Zielinski", "Szymanski", "Wozniak", "Dabrowski",
+    "Kozlowski", "Jankowski", "Mazur", "Kwiatkowski", "Krawczyk",
+]
+DOMAINS = ["example.com", "example.org", "example.net"]
+
+WAITLIST = Status.WAITLIST.value
+ACCEPTED = Status.ACCEPTED.value
+REJECTED = Status.REJECTED.value
+CANCELLED = Status.CANCELLED.value
+STATUS_INDEX = {WAITLIST: 0, ACCEPTED: 1, REJECTED: 2, CANCELLED: 3}
+
+# Registrations are drawn this many at a time (one `random.choices` call)
+DRAW_BATCH = 10_000
+
+
+class DataGenerator:
+    """
+    Deterministic row source. Tables must be generated in order (users,
+    events, registrations): each one draws its foreign keys from the ids the
+    previous one produced, and every value comes from a single seeded RNG.
+    """
+
+    def __init__(self, seed: int, anchor: date, organizers: int, password_hash: str):
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.anchor = datetime(anchor.year, anchor.month, anchor.day, tzinfo=UTC)
+        self.organizers = organizers
+        self.password_hash = password_hash
+        self.user_ids: list[uuid.UUID] = []
+        self.event_ids: list[uuid.UUID] = []
+        self.event_dates: list[datetime] = []
+        self.capacities: list[int | None] = []
+        # Per event: registrations by status, in STATUS_INDEX order
+        self.counts: list[list[int]] = []
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def users(self, n: int) -> Iterator[tuple]:
+        rng = self.rng
+        for i in range(n):
+            user_id = self._uuid()
+            self.user_ids.append(user_id)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f"{first}.{last}.{self.seed}.{i}@{rng.choice(DOMAINS)}".lower()
+            joined = self.anchor - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+            yield (
+                user_id, email, self.password_hash, True, True, False,
+                joined, joined,
+            )
+
+    def events(self, n: int) -> Iterator[tuple]:
+        rng = self.rng
+        organizer_ids = self.user_ids[: self.organizers]
+        for _ in range(n):
+            event_id = self._uuid()
+            when = self.anchor + timedelta(
+                minutes=rng.randrange(-180 * 1440, 365 * 1440)
+            )
+            capacity = rng.randrange(20, 500) if rng.random() < 1 / 3 else None
+            # Created ahead of the event, but never after the anchor
+            created = min(when, self.anchor) - timedelta(
+                minutes=rng.randrange(7 * 1440, 120 * 1440)
+            )
+            self.event_ids.append(event_id)
+            self.event_dates.append(when)
+            self.capacities.append(capacity)
+            self.counts.append([0, 0, 0, 0])
+            words = rng.sample(WORDS, 3)
+            city = rng.choice(CITIES)
+            yield (
+                event_id,
+                f"{words[0].capitalize()} {words[1]} night",
+                f"Join us in {city} for {words[1]}, {words[2]} and friends.",
+                city,
+                # events.date is a naive UTC timestamp
+                when.replace(tzinfo=None),
+                self._uuid(),
+                rng.random() < 2 / 3,
+                capacity,
+                0,  # seats_taken, set once registrations are loaded
+                rng.choice(organizer_ids),
+                created,
+                created,
+            )
+
+    def _status(self, event: int) -> str:
+        counts = self.counts[event]
+        capacity = self.capacities[event]
+        roll = self.rng.random()
+        if roll < 0.08:
+            status = CANCELLED
+        elif roll < 0.2:
+            status = REJECTED
+        elif roll < 0.7:
+            status = ACCEPTED
+        else:
+            status = WAITLIST
+        if status == ACCEPTED and capacity is not None and counts[1] >= capacity:
+            status = WAITLIST
+        counts[STATUS_INDEX[status]] += 1
+        return status
+
+    def registrations(self, n: int) -> Iterator[tuple]:
+        rng = self.rng
+        # Heavy-tailed popularity: a few events draw most of the sign-ups
+        cum_weights = list(
+            itertools.accumulate(rng.paretovariate(1.2) for _ in self.event_ids)
+        )
+        events = range(len(self.event_ids))
+        remaining = n
+        while remaining:
+            draws = min(DRAW_BATCH, remaining)
+            remaining -= draws
+            for event in rng.choices(events, cum_weights=cum_weights, k=draws):
+                created = min(self.event_dates[event], self.anchor) - timedelta(
+                    seconds=rng.randrange(60, 60 * 86400)
+                )
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                email = (
+                    f"{first}.{last}{rng.randrange(10**6)}@{rng.choice(DOMAINS)}"
+                    if rng.random() < 0.7
+                    else None
+                )
+                yield (
+                    self._uuid(),
+                    first,
+                    last,
+                    f"+48{rng.randrange(500_000_000, 900_000_000)}",
+                    email and email.lower(),
+                    self._status(event),
+                    self.event_ids[event],
+                    created,
+                    created,
+                )
+
+    def count_rows(self) -> Iterator[tuple]:
+        for event_id, counts in zip(self.event_ids, self.counts, strict=True):
+            for status, index in STATUS_INDEX.items():
+                if counts[index]:
+                    yield event_id, status, 0, counts[index]
+
+    def seats_taken(self) -> tuple[list[uuid.UUID], list[int]]:
+        pairs = [
+            (event_id, counts[1])
+            for event_id, capacity, counts in zip(
+                self.event_ids, self.capacities, self.counts, strict=True
+            )
+            if capacity is not None and counts[1]
+        ]
+        return [event_id for event_id, _ in pairs], [n for _, n in pairs]
+
+
+SET_SEATS_TAKEN = text(
+    """
+    UPDATE events SET seats_taken = taken.n
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:seats AS int[])) AS taken(id, n)
+    WHERE events.id = taken.id
+    """
+)
+
+
+async def load(args: argparse.Namespace) -> dict:
+    generator = DataGenerator(
+        args.seed, args.anchor, args.organizers, hash_password(args.password)
+    )
+    tables = {}
+    async with async_engine.connect() as conn:
+        # Only this transaction may skip waiting for the WAL flush
+        await conn.execute(text("SET LOCAL synchronous_commit = off"))
+        if args.truncate:
+            await conn.execute(text("TRUNCATE users, events, registrations CASCADE"))
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        for table, columns, rows in (
+            ("users", USER_COLUMNS, generator.users(args.users)),
+            ("events", EVENT_COLUMNS, generator.events(args.events)),
+            (
+                "registrations",
+                REGISTRATION_COLUMNS,
+                generator.registrations(args.registrations),
+            ),
+            ("registration_counts", COUNT_COLUMNS, generator.count_rows()),
+        ):
+            started = time.perf_counter()
+            status = await driver.copy_records_to_table(
+                table, records=rows, columns=columns
+            )
+            elapsed = time.perf_counter() - started
+            loaded = int(status.split()[-1])
+            tables[table] = {
+                "rows": loaded,
+                "seconds": round(elapsed, 1),
+                "rows_per_minute": round(loaded / elapsed * 60) if elapsed else None,
+            }
+
+        ids, seats = generator.seats_taken()
+        await conn.execute(SET_SEATS_TAKEN, {"ids": ids, "seats": seats})
+        # The next rollup run starts from scratch and covers the loaded rows
+        await conn.execute(delete(RollupWatermark).filter_by(name=WATERMARK))
+        await conn.commit()
+
+    async with async_engine.connect() as conn:
+        autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in tables:
+            await autocommit.execute(text(f"ANALYZE {table}"))
+    invalidate_event_lists()
+    return tables
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--organizers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--registrations", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--anchor",
+        type=date.fromisoformat,
+        default=datetime.now(UTC).date(),
+        help="Date the generated timeline is centred on (default: today)",
+    )
+    parser.add_argument("--password", default="password123")
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Empty users, events and registrations (CASCADE) before loading",
+    )
+    args = parser.parse_args()
+    if not 0 < args.organizers <= args.users:
+        parser.error("--organizers must be between 1 and --users")
+    if args.registrations and not args.events:
+        parser.error("--registrations needs --events")
+
+    started = time.perf_counter()
+    tables = await load(args)
+    elapsed = time.perf_counter() - started
+    rows = sum(table["rows"] for table in tables.values())
+    print(
+        json.dumps(
+            {
+                "seed": args.seed,
+                "anchor": args.anchor.isoformat(),
+                "tables": tables,
+                "rows": rows,
+                "seconds": round(elapsed, 1),
+                "rows_per_minute": round(rows / elapsed * 60),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Compare the sync (threadpool) and async (asyncpg) database paths.
+
+Both variants run the same `list_events` query against the database in
+DATABASE_URL, the sync one through `SessionLocal` inside a plain `def`
+endpoint and the async one through `AsyncSessionLocal`.
+
+    python -m benchmarks.db_path --requests 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.database.database import AsyncSessionLocal, SessionLocal
+from app.models.event import Event
+from app.schemas.event import EventOut
+from benchmarks.stats import percentile
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync/events/", response_model=list[EventOut])
+def sync_list_events(limit: int = 10):
+    with SessionLocal() as db:
+        query = select(Event).filter(Event.date >= datetime.utcnow())
+        return db.scalars(query.order_by(Event.date.asc()).limit(limit)).all()
+
+
+@bench_app.get("/async/events/", response_model=list[EventOut])
+async def async_list_events(limit: int = 10):
+    async with AsyncSessionLocal() as db:
+        query = select(Event).filter(Event.date >= datetime.utcnow())
+        result = await db.scalars(query.order_by(Event.date.asc()).limit(limit))
+        return result.all()
+
+
+async def run(path: str, total: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=bench_app)
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        # Warm up the pools before measuring
+        await client.get(path)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    results = [
+        await run(path, args.requests, args.concurrency)
+        for path in ("/sync/events/", "/async/events/")
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
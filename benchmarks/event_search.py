@@ -0,0 +1,159 @@
+"""
+Latency of `/events/search` over a large synthetic events table.
+
+`--events` rows are generated inside Postgres (DATABASE_URL) under a
+throwaway organizer: titles and locations draw from a small vocabulary, so
+plain words match a large share of the table, while each description also
+carries a `batch<N>` token shared by roughly `--events / 50000` rows, which
+stands in for a selective search. Each query is sent `--repeat` times
+through the real app, with and without `upcoming_only`, and p50/p95 are
+reported, along with the indexes in the plan: selective terms should go
+through `ix_events_search_vector`, common upcoming ones through
+`ix_events_date_id` (ranking only the soonest EVENT_SEARCH_CANDIDATES
+matches). Searches over all dates rank the full match set, so common terms
+there are expected to scan the table. The rows are deleted afterwards.
+
+    python -m benchmarks.event_search --events 5000000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+from sqlalchemy import text
+
+from app.database.database import SessionLocal, engine
+from app.main import app
+from app.routers.event import search_query
+from benchmarks.organizers import add_organizer, delete_organizers
+
+WORDS = [
+    "jazz", "python", "marathon", "wine", "startup", "yoga", "poetry",
+    "chess", "robotics", "gardening", "photography", "salsa", "cinema",
+    "hackathon", "pottery", "climbing", "choir", "baking", "astronomy",
+    "design", "kayak", "theatre", "vinyl", "cycling", "painting",
+]
+CITIES = [
+    "Warsaw", "Krakow", "Gdansk", "Wroclaw", "Poznan", "Lodz", "Lublin",
+    "Berlin", "Prague", "Vienna",
+]
+
+SEED = text(
+    """
+    INSERT INTO events (id, title, description, location, date, share_uuid,
+                        is_public, organizer_id)
+    SELECT gen_random_uuid(),
+           initcap(w[1 + (i * 7) % cardinality(w)]) || ' ' ||
+               w[1 + (i * 13 / 3) % cardinality(w)] || ' night',
+           'Join us for ' || w[1 + (i * 11) % cardinality(w)] ||
+               ' and friends. batch' || (i % 50000),
+           c[1 + i % cardinality(c)],
+           now() - interval '30 days' + (i % 525600) * interval '1 minute',
+           gen_random_uuid(),
+           i % 3 = 0,
+           :organizer_id
+    FROM generate_series(1, :events) AS i,
+         (SELECT CAST(:words AS text[]) AS w, CAST(:cities AS text[]) AS c) AS v
+    """
+)
+
+INDEXES = ["ix_events_search_vector", "ix_events_date_id"]
+
+QUERIES = {
+    "selective": "batch4242",
+    "selective_and_common": "batch4242 jazz",
+    "common": "jazz",
+    "phrase": '"jazz night"',
+    "or": "pottery or kayak",
+    "location": "Gdansk",
+}
+
+
+def seed(events: int) -> uuid.UUID:
+    with SessionLocal() as db:
+        organizer_id = add_organizer(db, "search")
+        db.execute(
+            SEED,
+            {
+                "organizer_id": organizer_id,
+                "events": events,
+                "words": WORDS,
+                "cities": CITIES,
+            },
+        )
+        db.commit()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE events"))
+    return organizer_id
+
+
+def plan_indexes(q: str, upcoming_only: bool) -> list[str]:
+    query = search_query(q, limit=10, upcoming_only=upcoming_only, public_only=False)
+    compiled = query.compile(engine)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+        plan = "\n".join(row[0] for row in rows)
+    return [name for name in INDEXES if name in plan]
+
+
+async def measure(repeat: int) -> list[dict]:
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, q in QUERIES.items():
+            for upcoming_only in (True, False):
+                params = {"q": q, "upcoming_only": upcoming_only}
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get("/events/search", params=params)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                timings.sort()
+                results.append(
+                    {
+                        "query": name,
+                        "q": q,
+                        "upcoming_only": upcoming_only,
+                        "results": len(response.json()),
+                        "p50_ms": round(statistics.median(timings), 2),
+                        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 2),
+                        "indexes": plan_indexes(q, upcoming_only),
+                    }
+                )
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    organizer_id = seed(args.events)
+    seeded_in = time.perf_counter() - started
+    try:
+        results = await measure(args.repeat)
+    finally:
+        delete_organizers([organizer_id])
+    print(
+        json.dumps(
+            {
+                "events": args.events,
+                "seed_s": round(seeded_in, 1),
+                "queries": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+"""
+Per-row CPU and memory of the list endpoints: whole ORM entities versus the
+column-projected queries they now run.
+
+Seeds one throwaway organizer with `--rows` upcoming events, and `--rows`
+registrations on the first of them, in Postgres (DATABASE_URL). Each list
+endpoint's query is then fetched and serialized in a single page of
+`--rows`, as it would be for a request:
+
+  entities    select(Event) / select(Registration), hydrated into the
+              session's identity map and serialized from attributes
+  projected   select() of the response columns only, serialized from the
+              rows (as `dump_rows` does)
+
+CPU time is this process's (the database's share is excluded) over
+`--repeat` runs, reported as the median per request and per row; memory is
+the tracemalloc peak of one further run. The rows are deleted afterwards.
+
+    python -m benchmarks.list_projection --rows 10000 --repeat 10
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import select, text
+
+from app.database.database import AsyncSessionLocal, SessionLocal, engine
+from app.models.event import Event
+from app.models.registration import Registration
+from app.routers.event import EVENT_LIST_COLUMNS, filter_listed, page_query
+from app.routers.registration import REGISTRATION_OUT_COLUMNS
+from app.schemas.event import event_list_adapter
+from app.schemas.registration import registration_list_adapter
+from app.utils.responses import dump_rows
+from benchmarks.organizers import add_organizer, delete_organizers
+
+SEED_EVENTS = text(
+    """
+    INSERT INTO events (id, title, description, location, date, share_uuid,
+                        is_public, organizer_id)
+    SELECT gen_random_uuid(), 'Event ' || i, 'A benchmark event number ' || i,
+           'Warsaw', now() + i * interval '1 minute', gen_random_uuid(),
+           i % 2 = 0, :organizer_id
+    FROM generate_series(1, :rows) AS i
+    """
+)
+SEED_REGISTRATIONS = text(
+    """
+    INSERT INTO registrations (id, name, surname, phone, email, status, event_id)
+    SELECT gen_random_uuid(), 'Name' || i, 'Surname' || i, '+48' || i,
+           'user' || i || '@example.com',
+           (ARRAY['waitlist', 'accepted', 'rejected', 'cancelled'])[1 + i % 4],
+           :event_id
+    FROM generate_series(1, :rows) AS i
+    """
+)
+
+
+def seed(rows: int) -> tuple[uuid.UUID, uuid.UUID]:
+    with SessionLocal() as db:
+        organizer_id = add_organizer(db, "projection")
+        db.execute(SEED_EVENTS, {"organizer_id": organizer_id, "rows": rows})
+        event_id = db.scalar(
+            select(Event.id)
+            .filter_by(organizer_id=organizer_id)
+            .order_by(Event.date)
+            .limit(1)
+        )
+        db.execute(SEED_REGISTRATIONS, {"event_id": event_id, "rows": rows})
+        db.commit()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE events"))
+        conn.execute(text("ANALYZE registrations"))
+    return organizer_id, event_id
+
+
+def endpoints(organizer_id: uuid.UUID, event_id: uuid.UUID, rows: int) -> dict:
+    def events_page(columns, *criteria):
+        query = filter_listed(
+            select(*columns), upcoming_only=True, public_only=False
+        )
+        return page_query(query.filter(*criteria), None, 0, rows)
+
+    return {
+        "list_events": (
+            event_list_adapter,
+            events_page([Event], Event.organizer_id == organizer_id),
+            events_page(EVENT_LIST_COLUMNS, Event.organizer_id == organizer_id),
+        ),
+        "my_events": (
+            event_list_adapter,
+            page_query(
+                select(Event).filter_by(organizer_id=organizer_id), None, 0, rows
+            ),
+            page_query(
+                select(*EVENT_LIST_COLUMNS).filter_by(organizer_id=organizer_id),
+                None,
+                0,
+                rows,
+            ),
+        ),
+        "list_registrations": (
+            registration_list_adapter,
+            select(Registration).filter_by(event_id=event_id),
+            select(*REGISTRATION_OUT_COLUMNS).filter_by(event_id=event_id),
+        ),
+    }
+
+
+async def fetch_and_dump(adapter, query, entities: bool) -> tuple[int, bytes]:
+    async with AsyncSessionLocal() as db:
+        if entities:
+            rows = (await db.scalars(query)).all()
+        else:
+            rows = (await db.execute(query)).all()
+        return len(rows), dump_rows(adapter, rows)
+
+
+async def measure(adapter, query, entities: bool, repeat: int) -> dict:
+    n, body = await fetch_and_dump(adapter, query, entities)  # warm up
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.process_time()
+        await fetch_and_dump(adapter, query, entities)
+        timings.append((time.process_time() - started) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    await fetch_and_dump(adapter, query, entities)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cpu_ms = statistics.median(timings)
+    return {
+        "rows": n,
+        "body_bytes": len(body),
+        "cpu_ms": round(cpu_ms, 1),
+        "cpu_us_per_row": round(cpu_ms * 1000 / n, 2),
+        "peak_mb": round(peak / 2**20, 1),
+        "peak_bytes_per_row": peak // n,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    organizer_id, event_id = seed(args.rows)
+    results = {}
+    try:
+        for name, (adapter, entities, projected) in endpoints(
+            organizer_id, event_id, args.rows
+        ).items():
+            before = await measure(adapter, entities, True, args.repeat)
+            after = await measure(adapter, projected, False, args.repeat)
+            results[name] = {
+                "entities": before,
+                "projected": after,
+                "cpu_reduction": round(1 - after["cpu_ms"] / before["cpu_ms"], 2),
+                "memory_reduction": round(
+                    1 - after["peak_mb"] / before["peak_mb"], 2
+                ),
+            }
+    finally:
+        delete_organizers([organizer_id])
+    print(json.dumps({"rows": args.rows, "endpoints": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,198 @@
+"""
+Load-test the API in-process against the Postgres and Redis from `.env`.
+
+Seeds a tagged dataset (`--users`, `--organizers`, `--events`,
+`--registrations`), then runs each selected scenario through the real app
+with `--concurrency` virtual users until its request budget is spent:
+
+  login_storm        seeded users logging in (Argon2 verification)
+  browse             anonymous event pages (with ETag revalidation),
+                     event details and search
+  ticket_drop        registrations racing for one capacity-limited event
+  organizer_triage   organizers reading stats and registrations and
+                     accepting/rejecting waitlisted ones
+
+For every scenario and endpoint the result reports throughput, p50/p95/p99
+latency, status codes and SQL statements per request, as JSON on stdout
+and in `--output`. With `--compare`, the changes against an earlier result
+file are added, so runs before and after a change can be diffed. The
+seeded rows are deleted afterwards.
+
+    python -m benchmarks.load --output before.json
+    python -m benchmarks.load --output after.json --compare before.json
+    python -m benchmarks.load --scenario browse --requests 10000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from datetime import UTC, datetime
+
+import httpx
+
+from app.main import app
+from benchmarks.load.dataset import Dataset, cleanup, seed
+from benchmarks.load.metrics import Recorder, count_statements
+from benchmarks.load.scenarios import SCENARIOS, Scenario, VirtualUser, worker_rng
+
+COMPARED = {
+    "rps": lambda result: result.get("rps"),
+    "p50_ms": lambda result: result.get("latency_ms", {}).get("p50"),
+    "p95_ms": lambda result: result.get("latency_ms", {}).get("p95"),
+    "p99_ms": lambda result: result.get("latency_ms", {}).get("p99"),
+    "queries_per_request": lambda result: result.get("queries", {}).get("per_request"),
+}
+
+
+async def run_scenario(
+    name: str,
+    scenario: Scenario,
+    dataset: Dataset,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=count_statements(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+
+        async def worker(n: int):
+            user = VirtualUser(client, recorder, dataset, worker_rng(seed, name, n))
+            while recorder.count < requests:
+                await scenario.step(user)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    result = {
+        "description": scenario.description,
+        "duration_s": round(elapsed, 2),
+        **recorder.summary(elapsed),
+    }
+    if scenario.check:
+        result["check"] = scenario.check(dataset)
+    return result
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """
+    Relative change of each headline metric against a previous run, plus the
+    parameters that differ between the two (which make the numbers moot).
+    """
+    parameters = baseline.get("parameters", {})
+    changes = {
+        "parameter_changes": {
+            key: {"baseline": parameters.get(key), "current": value}
+            for key, value in report["parameters"].items()
+            if parameters.get(key) != value
+        },
+        "scenarios": {},
+    }
+    for name, result in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        changes["scenarios"][name] = {}
+        for metric, get in COMPARED.items():
+            old, new = get(before), get(result)
+            changes["scenarios"][name][metric] = {
+                "baseline": old,
+                "current": new,
+                "change": round(new / old - 1, 3) if old and new is not None else None,
+            }
+    return changes
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Run only this scenario (repeatable); all by default",
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--organizers", type=int, default=50)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--registrations", type=int, default=50_000)
+    parser.add_argument("--drop-capacity", type=int, default=100)
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=None,
+        help="Requests per scenario (default: login_storm 200, others 2000)",
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Also write the result to this file")
+    parser.add_argument("--compare", help="Result file of a previous run")
+    args = parser.parse_args()
+    if args.organizers > args.users:
+        parser.error("--organizers cannot exceed --users")
+
+    started = time.perf_counter()
+    dataset = seed(
+        args.users,
+        args.organizers,
+        args.events,
+        args.registrations,
+        args.drop_capacity,
+    )
+    seeded_in = time.perf_counter() - started
+
+    results = {}
+    try:
+        for name in args.scenario or SCENARIOS:
+            scenario = SCENARIOS[name]
+            results[name] = await run_scenario(
+                name,
+                scenario,
+                dataset,
+                args.requests or scenario.requests,
+                args.concurrency,
+                args.seed,
+            )
+    finally:
+        cleanup(dataset)
+
+    report = {
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "parameters": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "compare")
+        },
+        "seed_s": round(seeded_in, 1),
+        "scenarios": results,
+    }
+    if args.compare:
+        with open(args.compare) as file:
+            report["comparison"] = compare(report, json.load(file))
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,225 @@
+"""
+Seeded load-test dataset: users, events and registrations generated inside
+Postgres, tagged so a run only ever touches (and deletes) its own rows.
+
+Every user shares one password, hashed once up front with the app's current
+Argon2 parameters, so logins verify at production cost without a rehash and
+seeding does not spend minutes hashing. The first `organizers` users own the
+events round-robin; registrations are spread evenly over those events. One
+extra capacity-limited event, without registrations, is the ticket drop.
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+
+from app.database.database import SessionLocal, engine
+from app.models.event import Event
+from app.models.registration import Registration, Status
+from app.models.user import User
+from app.utils.cache import invalidate_event_lists
+from app.utils.jwt_token import create_access_token
+from app.utils.password import hash_password
+from app.utils.seats import reset_seat_counter
+from benchmarks.event_search import CITIES, WORDS
+from benchmarks.organizers import delete_organizers
+
+PASSWORD = "load-test-password"
+
+SEED_USERS = text(
+    """
+    INSERT INTO users (id, email, password_hash, is_active, is_confirmed,
+                       is_admin)
+    SELECT gen_random_uuid(), :prefix || i || '@example.com', :password_hash,
+           true, true, false
+    FROM generate_series(1, :users) AS i
+    """
+)
+SEED_EVENTS = text(
+    """
+    INSERT INTO events (id, title, description, location, date, share_uuid,
+                        is_public, organizer_id)
+    SELECT gen_random_uuid(),
+           initcap(w[1 + (i * 7) % cardinality(w)]) || ' ' ||
+               w[1 + (i * 13 / 3) % cardinality(w)] || ' night',
+           'Join us for ' || w[1 + (i * 11) % cardinality(w)] || ' and friends.',
+           c[1 + i % cardinality(c)],
+           now() + interval '1 hour' + (i % 525600) * interval '1 minute',
+           gen_random_uuid(),
+           i % 3 <> 0,
+           o[1 + i % cardinality(o)]
+    FROM generate_series(1, :events) AS i,
+         (SELECT CAST(:words AS text[]) AS w, CAST(:cities AS text[]) AS c,
+                 CAST(:organizers AS uuid[]) AS o) AS v
+    """
+)
+# Half waitlisted, so organizers have something to triage
+SEED_REGISTRATIONS = text(
+    """
+    INSERT INTO registrations (id, name, surname, phone, email, status,
+                               event_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Guest' || i, 'Load', '+48' || (500000000 + i),
+           'guest' || i || '@example.com',
+           CASE WHEN i % 10 < 5 THEN 'waitlist'
+                WHEN i % 10 < 8 THEN 'accepted'
+                WHEN i % 10 < 9 THEN 'rejected'
+                ELSE 'cancelled' END,
+           e[1 + i % cardinality(e)],
+           now() - (i % 43200) * interval '1 minute',
+           now() - (i % 43200) * interval '1 minute'
+    FROM generate_series(1, :registrations) AS i,
+         (SELECT CAST(:events AS uuid[]) AS e) AS v
+    """
+)
+SEED_COUNTS = text(
+    """
+    INSERT INTO registration_counts (event_id, status, shard, count)
+    SELECT event_id, status, 0, count(*)
+    FROM registrations
+    WHERE event_id = ANY(CAST(:events AS uuid[]))
+    GROUP BY event_id, status
+    """
+)
+
+
+@dataclass
+class Dataset:
+    tag: str
+    emails: list[str]
+    organizer_ids: list[uuid.UUID]
+    event_ids: list[uuid.UUID]
+    drop_event_id: uuid.UUID
+    drop_capacity: int
+    # Bearer tokens of the organizers, minted directly so that scenarios
+    # other than the login storm don't pay for Argon2
+    organizer_tokens: dict[uuid.UUID, str] = field(default_factory=dict)
+    organizer_events: dict[uuid.UUID, list[uuid.UUID]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+    @property
+    def email_prefix(self) -> str:
+        return email_prefix(self.tag)
+
+
+def email_prefix(tag: str) -> str:
+    return f"load-{tag}-"
+
+
+def seed(
+    users: int,
+    organizers: int,
+    events: int,
+    registrations: int,
+    drop_capacity: int,
+) -> Dataset:
+    tag = uuid.uuid4().hex[:8]
+    prefix = email_prefix(tag)
+    with SessionLocal() as db:
+        db.execute(
+            SEED_USERS,
+            {
+                "prefix": prefix,
+                "password_hash": hash_password(PASSWORD),
+                "users": users,
+            },
+        )
+        rows = db.execute(
+            select(User.id, User.email)
+            .filter(User.email.like(f"{prefix}%"))
+            .order_by(User.created_at, User.email)
+        ).all()
+        organizer_ids = [row.id for row in rows[:organizers]]
+        db.execute(
+            SEED_EVENTS,
+            {
+                "events": events,
+                "words": WORDS,
+                "cities": CITIES,
+                "organizers": organizer_ids,
+            },
+        )
+        event_rows = db.execute(
+            select(Event.id, Event.organizer_id)
+            .filter(Event.organizer_id.in_(organizer_ids))
+            .order_by(Event.date, Event.id)
+        ).all()
+        event_ids = [row.id for row in event_rows]
+        db.execute(
+            SEED_REGISTRATIONS, {"registrations": registrations, "events": event_ids}
+        )
+        db.execute(SEED_COUNTS, {"events": event_ids})
+
+        drop = Event(
+            title="Ticket drop",
+            description="Load test ticket drop",
+            location="Warsaw",
+            date=datetime.utcnow() + timedelta(days=30),
+            is_public=True,
+            capacity=drop_capacity,
+            organizer_id=organizer_ids[0],
+        )
+        db.add(drop)
+        db.commit()
+        drop_event_id = drop.id
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("users", "events", "registrations", "registration_counts"):
+            conn.execute(text(f"ANALYZE {table}"))
+    # Every run starts from cold list caches and a fresh seat counter
+    invalidate_event_lists()
+    reset_seat_counter(drop_event_id)
+
+    dataset = Dataset(
+        tag=tag,
+        emails=[row.email for row in rows],
+        organizer_ids=organizer_ids,
+        event_ids=event_ids,
+        drop_event_id=drop_event_id,
+        drop_capacity=drop_capacity,
+    )
+    emails = dict(rows)
+    for organizer_id in organizer_ids:
+        token_data = {
+            "sub": str(organizer_id),
+            "email": emails[organizer_id],
+            "is_admin": False,
+        }
+        dataset.organizer_tokens[organizer_id] = create_access_token(token_data)
+    for row in event_rows:
+        dataset.organizer_events[row.organizer_id].append(row.id)
+    return dataset
+
+
+def ticket_drop_outcome(dataset: Dataset) -> dict:
+    """Accepted registrations on the drop event against its capacity."""
+    with SessionLocal() as db:
+        counts = dict(
+            db.execute(
+                select(Registration.status, func.count())
+                .filter_by(event_id=dataset.drop_event_id)
+                .group_by(Registration.status)
+            ).all()
+        )
+        seats_taken = db.scalar(
+            select(Event.seats_taken).filter_by(id=dataset.drop_event_id)
+        )
+    accepted = counts.get(Status.ACCEPTED, 0)
+    return {
+        "capacity": dataset.drop_capacity,
+        "registered": sum(counts.values()),
+        "accepted": accepted,
+        "seats_taken": seats_taken,
+        "oversold": accepted > dataset.drop_capacity or accepted != seats_taken,
+    }
+
+
+def cleanup(dataset: Dataset) -> None:
+    delete_organizers(
+        dataset.organizer_ids, User.email.like(f"{dataset.email_prefix}%")
+    )
+    invalidate_event_lists()
+    reset_seat_counter(dataset.drop_event_id)
@@ -0,0 +1,103 @@
+"""
+Per-request latency, status and SQL statement counts.
+
+Statements are the app's own per-request tally (`RequestStats`, kept by
+`MetricsMiddleware`), read off the ASGI scope by `count_statements` once
+the app returns. The in-process transport runs the app in the caller's
+task, so the count reaches the `Recorder.request` call that sent the
+request through a context variable and concurrent requests never mix.
+"""
+
+import statistics
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import httpx
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from benchmarks.stats import percentile
+
+_statements: ContextVar[list[int] | None] = ContextVar("statements", default=None)
+
+
+def count_statements(app: ASGIApp) -> ASGIApp:
+    """Wrap `app` to hand each request's statement count to its Recorder call."""
+
+    async def counted(scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await app(scope, receive, send)
+        finally:
+            counter = _statements.get()
+            stats = scope.get("state", {}).get("request_stats")
+            if counter is not None and stats is not None:
+                counter[0] = stats.statements
+
+    return counted
+
+
+@dataclass
+class Sample:
+    seconds: float
+    status: int
+    queries: int
+
+
+class Recorder:
+    """Collects samples per endpoint label for one scenario run."""
+
+    def __init__(self):
+        self.samples: dict[str, list[Sample]] = defaultdict(list)
+        self.count = 0
+
+    async def request(
+        self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        self.count += 1
+        counter = [0]
+        token = _statements.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        finally:
+            _statements.reset(token)
+        self.samples[label].append(
+            Sample(time.perf_counter() - started, response.status_code, counter[0])
+        )
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        every = [sample for samples in self.samples.values() for sample in samples]
+        return {
+            **summarize(every, elapsed),
+            "endpoints": {
+                label: summarize(samples, elapsed)
+                for label, samples in sorted(self.samples.items())
+            },
+        }
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    if not samples:
+        return {"requests": 0}
+    latencies = [sample.seconds * 1000 for sample in samples]
+    queries = [sample.queries for sample in samples]
+    statuses = Counter(sample.status for sample in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(n for status, n in statuses.items() if status >= 400),
+        "rps": round(len(samples) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies), 2),
+        },
+        "queries": {
+            "total": sum(queries),
+            "per_request": round(statistics.mean(queries), 2),
+            "p95": percentile(queries, 95),
+        },
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+    }
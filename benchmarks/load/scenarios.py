@@ -0,0 +1,167 @@
+"""
+Scripted load scenarios. A scenario's `step` is one virtual user action,
+made of one or more requests; the runner calls it from `--concurrency`
+workers until the scenario's request budget is spent. Each worker has its
+own seeded `random.Random`, so a run with the same seed and dataset
+parameters issues the same request mix.
+"""
+
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from benchmarks.event_search import CITIES, WORDS
+from benchmarks.load.dataset import PASSWORD, Dataset, ticket_drop_outcome
+from benchmarks.load.metrics import Recorder
+
+
+@dataclass
+class VirtualUser:
+    client: httpx.AsyncClient
+    recorder: Recorder
+    dataset: Dataset
+    rng: random.Random
+    # ETags of pages this user has seen, revalidated like a browser would
+    etags: dict[str, str] = field(default_factory=dict)
+
+    async def get(self, label: str, url: str, **kwargs) -> httpx.Response:
+        return await self.recorder.request(self.client, label, "GET", url, **kwargs)
+
+    async def send(
+        self, label: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        return await self.recorder.request(self.client, label, method, url, **kwargs)
+
+
+@dataclass
+class Scenario:
+    description: str
+    step: Callable[[VirtualUser], Awaitable[None]]
+    # Default request budget; logins are far more expensive than the rest
+    requests: int = 2000
+    # Summarises the end state, e.g. whether the ticket drop was oversold
+    check: Callable[[Dataset], dict] | None = None
+
+
+async def login_storm(user: VirtualUser) -> None:
+    email = user.rng.choice(user.dataset.emails)
+    await user.send(
+        "POST /auth/login/",
+        "POST",
+        "/auth/login/",
+        json={"email": email, "password": PASSWORD},
+    )
+
+
+async def browse_events(user: VirtualUser) -> None:
+    """List a page or two, revalidating the first, open an event, search."""
+    params = {"limit": 20}
+    first_page = "/events/events/?limit=20"
+    headers = {}
+    if first_page in user.etags and user.rng.random() < 0.5:
+        headers["If-None-Match"] = user.etags[first_page]
+    response = await user.get(
+        "GET /events/events/", "/events/events/", params=params, headers=headers
+    )
+    if "etag" in response.headers:
+        user.etags[first_page] = response.headers["etag"]
+
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    if cursor and user.rng.random() < 0.3:
+        await user.get(
+            "GET /events/events/ (next page)",
+            "/events/events/",
+            params={**params, "cursor": cursor},
+        )
+
+    event_id = user.rng.choice(user.dataset.event_ids)
+    await user.get("GET /events/events/{id}", f"/events/events/{event_id}")
+
+    if user.rng.random() < 0.5:
+        q = user.rng.choice(WORDS + CITIES)
+        await user.get("GET /events/search", "/events/search", params={"q": q})
+
+
+async def ticket_drop(user: VirtualUser) -> None:
+    n = user.rng.randrange(10**9)
+    await user.send(
+        "POST /registrations/events/{id}/register",
+        "POST",
+        f"/registrations/events/{user.dataset.drop_event_id}/register",
+        json={"name": f"Fan{n}", "surname": "Drop", "phone": f"+48{n:09d}"},
+    )
+
+
+async def organizer_triage(user: VirtualUser) -> None:
+    """An organizer checks an event's numbers and works through its waitlist."""
+    organizer_id = user.rng.choice(user.dataset.organizer_ids)
+    headers = {
+        "Authorization": f"Bearer {user.dataset.organizer_tokens[organizer_id]}"
+    }
+    await user.get("GET /events/my/", "/events/my/", headers=headers)
+
+    event_ids = user.dataset.organizer_events[organizer_id]
+    if not event_ids:
+        return
+    event_id = user.rng.choice(event_ids)
+    await user.get(
+        "GET /events/events/{id}/stats",
+        f"/events/events/{event_id}/stats",
+        headers=headers,
+    )
+    response = await user.get(
+        "GET /registrations/events/{id}/registrations",
+        f"/registrations/events/{event_id}/registrations",
+        headers=headers,
+    )
+    if response.status_code != 200:
+        return
+    waitlisted = [
+        registration["id"]
+        for registration in response.json()
+        if registration["status"] == "waitlist"
+    ]
+    if not waitlisted:
+        return
+    if user.rng.random() < 0.7:
+        await user.send(
+            "PUT /registrations/registrations/{id}",
+            "PUT",
+            f"/registrations/registrations/{user.rng.choice(waitlisted)}",
+            headers=headers,
+            json={"status": user.rng.choice(["accepted", "rejected"])},
+        )
+    else:
+        await user.send(
+            "PUT /registrations/events/{id}/registrations/status",
+            "PUT",
+            f"/registrations/events/{event_id}/registrations/status",
+            headers=headers,
+            json={"accept_waitlisted": min(3, len(waitlisted))},
+        )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login_storm": Scenario(
+        "Seeded users logging in (Argon2 verification)", login_storm, requests=200
+    ),
+    "browse": Scenario(
+        "Anonymous browsing: event pages, details and search", browse_events
+    ),
+    "ticket_drop": Scenario(
+        "Everyone registering for one capacity-limited event",
+        ticket_drop,
+        check=ticket_drop_outcome,
+    ),
+    "organizer_triage": Scenario(
+        "Organizers reviewing stats and accepting/rejecting registrations",
+        organizer_triage,
+    ),
+}
+
+
+def worker_rng(seed: int, scenario: str, worker: int) -> random.Random:
+    return random.Random(f"{seed}:{scenario}:{worker}")
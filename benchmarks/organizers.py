@@ -0,0 +1,41 @@
+"""
+Throwaway organizers that benchmarks seed their rows under, so a run only
+ever deletes what it created.
+"""
+
+import uuid
+
+from sqlalchemy import ColumnElement, delete
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.event import Event
+from app.models.user import User
+
+
+def add_organizer(db: Session, benchmark: str) -> uuid.UUID:
+    """Flush a confirmed organizer that cannot log in and return its id."""
+    organizer = User(
+        email=f"{benchmark}-bench-{uuid.uuid4().hex}@example.com",
+        password_hash="!",
+        is_confirmed=True,
+    )
+    db.add(organizer)
+    db.flush()
+    return organizer.id
+
+
+def delete_organizers(
+    organizer_ids: list[uuid.UUID], users: ColumnElement[bool] | None = None
+) -> None:
+    """
+    Delete the organizers' events (registrations, counters and rollups go
+    with them, ON DELETE CASCADE), then the organizers, or every user
+    matching `users` when given.
+    """
+    if users is None:
+        users = User.id.in_(organizer_ids)
+    with SessionLocal() as db:
+        db.execute(delete(Event).filter(Event.organizer_id.in_(organizer_ids)))
+        db.execute(delete(User).filter(users))
+        db.commit()
@@ -0,0 +1,59 @@
+"""
+Login throughput of the Argon2 hashing service as the process pool grows.
+
+Runs `--verifications` concurrent password checks through HashingService for
+each pool size up to the number of CPUs and reports verifications/sec.
+
+    python -m benchmarks.password_hashing --verifications 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from app.utils.password import HashingService, hash_password
+
+
+async def run(workers: int, verifications: int, password_hash: str) -> dict:
+    service = HashingService(workers=workers, queue_size=verifications)
+    try:
+        # Start the worker processes before measuring
+        await asyncio.gather(
+            *(service.verify("password", password_hash) for _ in range(workers))
+        )
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(service.verify("password", password_hash) for _ in range(verifications))
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        service.shutdown()
+
+    assert all(is_valid for is_valid, _ in results)
+    return {
+        "workers": workers,
+        "verifications": verifications,
+        "per_sec": round(verifications / elapsed, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--verifications", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    password_hash = hash_password("password")
+    pool_sizes = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+    results = [
+        await run(workers, args.verifications, password_hash) for workers in pool_sizes
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Compare direct and write-behind registration ingestion.
+
+A throwaway event is created in the database from DATABASE_URL and
+`--registrations` public registrations are sent through the real app, first
+written directly, then queued on the Redis Stream. The queued ones are then
+flushed the way the Celery beat task does, and the flush throughput and the
+backlog metrics before/after are reported.
+
+    python -m benchmarks.registration_ingest --registrations 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.config import settings
+from app.utils.registration_stream import flush_registrations, stream_stats
+from benchmarks.seat_contention import cleanup, create_event, run
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--registrations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--capacity", type=int, default=None)
+    args = parser.parse_args()
+
+    organizer_id, event_id = create_event(args.capacity)
+    results = {}
+    try:
+        for mode, write_behind in (("direct", False), ("write_behind", True)):
+            settings.REGISTRATION_WRITE_BEHIND = write_behind
+            results[mode] = await run(event_id, args.registrations, args.concurrency)
+
+        results["backlog_before_flush"] = stream_stats()
+        started = time.perf_counter()
+        flushed = 0
+        while flushed < args.registrations:
+            written = flush_registrations(settings.REGISTRATION_FLUSH_BATCH_SIZE)
+            if not written:
+                break
+            flushed += written
+        elapsed = time.perf_counter() - started
+        results["flush"] = {
+            "rows": flushed,
+            "batch_size": settings.REGISTRATION_FLUSH_BATCH_SIZE,
+            "rows_per_s": round(flushed / elapsed, 1) if elapsed else None,
+        }
+        results["backlog_after_flush"] = stream_stats()
+    finally:
+        cleanup(organizer_id, event_id)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
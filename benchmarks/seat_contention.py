@@ -0,0 +1,128 @@
+"""
+Hammer one capacity-limited event with concurrent registrations and check
+that it is never oversold.
+
+A throwaway organizer and event are created in the database from
+DATABASE_URL, then `--registrations` public registrations are sent through
+the real app with `--concurrency` in flight. Afterwards the number of
+accepted registrations must equal both `seats_taken` and
+min(capacity, registrations); everything else must be waitlisted.
+
+    python -m benchmarks.seat_contention --capacity 50 --registrations 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import func, select
+
+from app.database.database import SessionLocal
+from app.main import app
+from app.models.event import Event
+from app.models.registration import Registration, Status
+from app.utils.seats import reset_seat_counter
+from benchmarks.organizers import add_organizer, delete_organizers
+
+
+def create_event(capacity: int | None) -> tuple[uuid.UUID, uuid.UUID]:
+    with SessionLocal() as db:
+        organizer_id = add_organizer(db, "seat")
+        event = Event(
+            title="Seat contention benchmark",
+            description="",
+            location="",
+            date=datetime.utcnow() + timedelta(days=1),
+            capacity=capacity,
+            organizer_id=organizer_id,
+        )
+        db.add(event)
+        db.commit()
+        return organizer_id, event.id
+
+
+def collect(event_id: uuid.UUID) -> dict:
+    with SessionLocal() as db:
+        counts = dict(
+            db.execute(
+                select(Registration.status, func.count())
+                .filter_by(event_id=event_id)
+                .group_by(Registration.status)
+            ).all()
+        )
+        seats_taken = db.scalar(select(Event.seats_taken).filter_by(id=event_id))
+    return {
+        "accepted": counts.get(Status.ACCEPTED, 0),
+        "waitlisted": counts.get(Status.WAITLIST, 0),
+        "seats_taken": seats_taken,
+    }
+
+
+def cleanup(organizer_id: uuid.UUID, event_id: uuid.UUID) -> None:
+    delete_organizers([organizer_id])
+    reset_seat_counter(event_id)
+
+
+async def run(event_id: uuid.UUID, total: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def register(i: int):
+            nonlocal errors
+            async with semaphore:
+                response = await client.post(
+                    f"/registrations/events/{event_id}/register",
+                    json={"name": f"bench-{i}", "phone": "0"},
+                )
+                if not response.is_success:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(register(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "registrations": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--registrations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    organizer_id, event_id = create_event(args.capacity)
+    try:
+        result = await run(event_id, args.registrations, args.concurrency)
+        result.update(capacity=args.capacity, **collect(event_id))
+    finally:
+        cleanup(organizer_id, event_id)
+
+    expected = min(args.capacity, args.registrations - result["errors"])
+    result["oversold"] = result["accepted"] > args.capacity
+    result["consistent"] = (
+        result["accepted"] == result["seats_taken"] == expected
+        and result["accepted"] + result["waitlisted"]
+        == args.registrations - result["errors"]
+    )
+    print(json.dumps(result, indent=2))
+    if result["oversold"] or not result["consistent"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""
+Cost of turning ORM rows into a JSON response body, per 1,000 objects.
+
+Builds `--objects` transient `Event` and `Registration` instances (no
+database needed) and times each way the API has serialized them:
+
+  jsonable_encoder   model_validate per row, `jsonable_encoder`, stdlib json
+  response_model     FastAPI's `response_model` handling, stdlib JSONResponse
+  response_model_orjson
+                     the same, rendered by ORJSONResponse (the app default)
+  type_adapter       `dump_rows`: a precompiled TypeAdapter validates the
+                     rows and writes JSON bytes directly (list endpoints)
+
+Each path runs `--repeat` times; the best and median run are reported in
+milliseconds per 1,000 objects.
+
+    python -m benchmarks.serialization --objects 10000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.event import Event
+from app.models.registration import Registration, Status
+from app.schemas.event import EventOut, event_list_adapter
+from app.schemas.registration import RegistrationOut, registration_list_adapter
+from app.utils.responses import dump_rows
+
+STATUSES = list(Status)
+
+
+def make_events(n: int) -> list[Event]:
+    start = datetime(2026, 1, 1)
+    return [
+        Event(
+            id=uuid.uuid4(),
+            title=f"Event {i}",
+            description="A fairly ordinary event description " * 3,
+            location="Warsaw",
+            date=start + timedelta(hours=i),
+            share_uuid=uuid.uuid4(),
+            is_public=i % 2 == 0,
+            capacity=100 if i % 3 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def make_registrations(n: int) -> list[Registration]:
+    return [
+        Registration(
+            id=uuid.uuid4(),
+            name=f"Name{i}",
+            surname=f"Surname{i}",
+            phone=f"+48{i:09d}",
+            email=f"user{i}@example.com",
+            status=STATUSES[i % len(STATUSES)].value,
+        )
+        for i in range(n)
+    ]
+
+
+def paths(schema, adapter) -> dict:
+    field = create_model_field(
+        name="Response", type_=list[schema], mode="serialization"
+    )
+
+    async def encoder(rows):
+        content = jsonable_encoder([schema.model_validate(row) for row in rows])
+        return JSONResponse(content).body
+
+    def response_model(response_class):
+        async def run(rows):
+            # What FastAPI's route handler does with a returned list
+            content = await serialize_response(field=field, response_content=rows)
+            return response_class(content).body
+
+        return run
+
+    async def type_adapter(rows):
+        return dump_rows(adapter, rows)
+
+    return {
+        "jsonable_encoder": encoder,
+        "response_model": response_model(JSONResponse),
+        "response_model_orjson": response_model(ORJSONResponse),
+        "type_adapter": type_adapter,
+    }
+
+
+async def measure(rows: list, schema, adapter, repeat: int) -> dict:
+    per_thousand = 1000 / len(rows)
+    results = {}
+    expected = None
+    for name, run in paths(schema, adapter).items():
+        body = await run(rows)  # warm up
+        # Every path must produce the same document
+        if expected is None:
+            expected = json.loads(body)
+        elif json.loads(body) != expected:
+            raise AssertionError(f"{name} produced a different payload")
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await run(rows)
+            timings.append((time.perf_counter() - started) * 1000 * per_thousand)
+        results[name] = {
+            "best_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+        }
+    baseline = results["response_model"]["median_ms"]
+    for result in results.values():
+        result["speedup"] = round(baseline / result["median_ms"], 2)
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            {
+                "objects": args.objects,
+                "unit": "per 1000 objects",
+                "EventOut": await measure(
+                    make_events(args.objects),
+                    EventOut,
+                    event_list_adapter,
+                    args.repeat,
+                ),
+                "RegistrationOut": await measure(
+                    make_registrations(args.objects),
+                    RegistrationOut,
+                    registration_list_adapter,
+                    args.repeat,
+                ),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Measure email worker throughput against a local aiosmtpd stand-in.
+
+Runs the verification email tasks in-process (no broker) against an
+aiosmtpd server on localhost and reports messages/sec for:
+
+- connection_per_message: the old behaviour, a fresh SMTP session per email
+- pooled: `send_email_verification`, reusing pooled sessions
+- batched: `send_email_verifications`, many emails per session
+
+`--latency-ms` delays every SMTP command reply on the server side, to
+approximate a remote relay where round trips dominate. STARTTLS and AUTH
+are off (the stand-in supports neither), which understates the savings
+against a real relay.
+
+    python -m benchmarks.smtp_throughput --messages 500 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import smtplib
+import socket
+import time
+
+from aiosmtpd.controller import Controller
+
+from app.core.config import settings
+from app.utils.smtp import smtp_pool
+from app.utils.tasks import (
+    send_email_verification,
+    send_email_verifications,
+    verification_message,
+)
+
+
+class CountingHandler:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):  # noqa: N802
+        await asyncio.sleep(self.latency)
+        session.host_name = hostname
+        return responses
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):  # noqa: N802
+        await asyncio.sleep(self.latency)
+        envelope.mail_from = address
+        envelope.mail_options.extend(mail_options)
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):  # noqa: N802
+        await asyncio.sleep(self.latency)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):  # noqa: N802
+        await asyncio.sleep(self.latency)
+        self.received += 1
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def connection_per_message(messages: list[tuple[str, str]]) -> None:
+    for to_email, code in messages:
+        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
+            server.send_message(verification_message(to_email, code))
+
+
+def pooled(messages: list[tuple[str, str]]) -> None:
+    for to_email, code in messages:
+        send_email_verification.apply(args=(to_email, code)).get()
+
+
+def batched(messages: list[tuple[str, str]]) -> None:
+    send_email_verifications.apply(args=(messages,)).get()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    handler = CountingHandler(args.latency_ms / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    settings.SMTP_SERVER = controller.hostname
+    settings.SMTP_PORT = controller.port
+    settings.SMTP_STARTTLS = False
+    settings.EMAIL_PASSWORD = ""
+
+    messages = [(f"user{i}@example.com", f"{i:06d}") for i in range(args.messages)]
+    results = []
+    try:
+        for mode in (connection_per_message, pooled, batched):
+            received = handler.received
+            started = time.perf_counter()
+            mode(messages)
+            elapsed = time.perf_counter() - started
+            results.append(
+                {
+                    "mode": mode.__name__,
+                    "messages": args.messages,
+                    "delivered": handler.received - received,
+                    "messages_per_s": round(args.messages / elapsed, 1),
+                }
+            )
+            smtp_pool.close()
+    finally:
+        controller.stop()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
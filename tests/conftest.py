@@ -0,0 +1,27 @@
+"""
+The tests run against the Postgres and Redis configured in `.env`, migrated
+with `alembic upgrade head`, like the benchmarks. They are skipped when the
+database cannot be reached.
+"""
+
+import pytest
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.database.database import engine
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Engine:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError:
+        pytest.skip("the database configured in .env is not reachable")
+    return engine
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # The app's async database and Redis clients run on asyncio only
+    return "asyncio"
@@ -0,0 +1,129 @@
+"""
+Query budgets fail requests that run too many statements once
+QUERY_BUDGET_ENFORCE is on.
+"""
+
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import Engine, delete, text
+
+from app.core.config import settings
+from app.database.database import SessionLocal, async_engine
+from app.main import app
+from app.models.event import Event
+from app.models.registration import Registration
+from app.models.user import User
+from app.utils.dependencies import db_dependency
+from app.utils.jwt_token import create_access_token
+from app.utils.metrics import MetricsMiddleware
+from app.utils.query_profiler import (
+    QueryBudgetExceededError,
+    QueryProfilerMiddleware,
+    query_budget,
+)
+from app.utils.redis import async_redis_client
+from app.utils.user_cache import invalidate_user
+
+pytestmark = pytest.mark.anyio
+
+# One route over its budget, behind the middleware of the real app
+budget_app = FastAPI()
+budget_app.add_middleware(QueryProfilerMiddleware)
+budget_app.add_middleware(MetricsMiddleware)
+
+
+@budget_app.get("/two-statements", dependencies=[query_budget(1)])
+async def two_statements(db: db_dependency):
+    await db.execute(text("SELECT 1"))
+    await db.execute(text("SELECT 2"))
+    return {}
+
+
+@pytest.fixture(autouse=True)
+async def close_async_connections() -> AsyncIterator[None]:
+    # Every test runs on an event loop of its own, and pooled asyncpg and
+    # Redis connections are bound to the loop that opened them
+    yield
+    await async_engine.dispose()
+    await async_redis_client.connection_pool.disconnect()
+
+
+@pytest.fixture
+def enforce_budgets(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ENFORCE", True)
+
+
+@pytest.fixture
+def organizer_event(db_engine: Engine) -> Iterator[tuple[User, uuid.UUID]]:
+    """An organizer with one event and a few registrations, deleted afterwards."""
+    with SessionLocal() as db:
+        organizer = User(
+            email=f"budget-test-{uuid.uuid4().hex}@example.com",
+            password_hash="!",
+            is_confirmed=True,
+        )
+        db.add(organizer)
+        db.flush()
+        event = Event(
+            title="Query budget test",
+            description="",
+            location="",
+            date=datetime.utcnow() + timedelta(days=1),
+            organizer_id=organizer.id,
+        )
+        db.add(event)
+        db.flush()
+        db.add_all(
+            Registration(event_id=event.id, name=f"Name {i}", phone="1")
+            for i in range(5)
+        )
+        db.commit()
+        db.refresh(organizer)
+        db.expunge(organizer)
+        event_id = event.id
+    yield organizer, event_id
+    with SessionLocal() as db:
+        db.execute(delete(Event).filter_by(id=event_id))
+        db.execute(delete(User).filter_by(id=organizer.id))
+        db.commit()
+
+
+async def test_list_registrations_stays_within_budget(
+    enforce_budgets, organizer_event: tuple[User, uuid.UUID]
+):
+    organizer, event_id = organizer_event
+    token = create_access_token(
+        {"sub": str(organizer.id), "email": organizer.email, "is_admin": False}
+    )
+    # Cold user cache: the user lookup counts against the budget too
+    await invalidate_user(organizer.id)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            f"/registrations/events/{event_id}/registrations",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+
+async def test_over_budget_request_fails(enforce_budgets, db_engine: Engine):
+    transport = httpx.ASGITransport(app=budget_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(QueryBudgetExceededError, match="over its budget of 1"):
+            await client.get("/two-statements")
+
+
+async def test_over_budget_request_is_only_logged_by_default(
+    db_engine: Engine, caplog: pytest.LogCaptureFixture
+):
+    transport = httpx.ASGITransport(app=budget_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/two-statements")
+    assert response.status_code == 200
+    assert "over its budget of 1" in caplog.text
@@ -0,0 +1,66 @@
+"""
+The hot query shapes must be served by the indexes from
+`add_query_indexes_20261018_01` and the analytics rollups.
+
+Test databases are small, and on small tables Postgres prefers sequential
+scans, or a bitmap scan plus a sort over whichever index is cheapest to
+read, so those are disabled while planning: the check is that the index can
+serve the query, not that the planner picks it at any size.
+"""
+
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import Engine, Select, select, text
+
+from app.models.analytics import RegistrationDailyRollup
+from app.models.event import Event
+from app.models.registration import Registration, Status
+
+QUERIES = {
+    "ix_events_date_id": select(Event)
+    .filter(Event.date >= datetime.utcnow())
+    .order_by(Event.date.asc(), Event.id.asc())
+    .limit(10),
+    "ix_events_organizer_id_date_id": select(Event)
+    .filter_by(organizer_id=uuid.uuid4())
+    .order_by(Event.date.asc(), Event.id.asc())
+    .limit(50),
+    "ix_events_public_date_id": select(Event)
+    .filter(Event.is_public, Event.date >= datetime.utcnow())
+    .order_by(Event.date.asc(), Event.id.asc())
+    .limit(10),
+    "ix_registrations_event_id_status_created_at": select(Registration)
+    .filter_by(event_id=uuid.uuid4(), status=Status.WAITLIST)
+    .order_by(Registration.created_at.asc())
+    .limit(100),
+    # Rollup runs: registrations and events changed since the watermark
+    "ix_registrations_updated_at": select(Registration.event_id).filter(
+        Registration.updated_at > datetime.utcnow()
+    ),
+    "ix_events_updated_at": select(Event.id).filter(
+        Event.updated_at > datetime.utcnow()
+    ),
+    # /events/my/analytics daily trend
+    "ix_registration_daily_rollups_organizer_id_day": select(
+        RegistrationDailyRollup
+    ).filter(
+        RegistrationDailyRollup.organizer_id == uuid.uuid4(),
+        RegistrationDailyRollup.day >= date.today(),
+    ),
+}
+
+
+def query_plan(engine: Engine, query: Select) -> str:
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.begin() as conn:
+        for setting in ("enable_seqscan", "enable_bitmapscan", "enable_sort"):
+            conn.execute(text(f"SET LOCAL {setting} = off"))
+        return "\n".join(row[0] for row in conn.execute(text(f"EXPLAIN {compiled}")))
+
+
+@pytest.mark.parametrize("index_name", QUERIES)
+def test_query_uses_index(db_engine: Engine, index_name: str):
+    plan = query_plan(db_engine, QUERIES[index_name])
+    assert index_name in plan, plan